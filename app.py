@@ -1,18 +1,55 @@
+import time
+STARTUP_STARTED = time.perf_counter()
+
 import streamlit as st
-import pandas as pd
-from datetime import datetime
+from streamlit import runtime
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+from datetime import datetime, timedelta
+import bisect
+import heapq
+import importlib
+import itertools
+import math
+import re
+from collections import Counter, deque
+import hashlib
+import html
 import json
 import io
-import base64
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-import time
-import zipfile
-import tempfile
 import os
+import pickle
+import subprocess
+import sys
+import threading
+import types
+from concurrent.futures import ThreadPoolExecutor
+
+# Lazy loading of heavy modules: imported on first attribute access, not at startup
+@st.cache_resource
+def get_lazy_import_times():
+    """Module name -> seconds spent importing it, kept for the life of the process"""
+    return {}
+
+class _LazyModule(types.ModuleType):
+    def __getattr__(self, attr):
+        started = time.perf_counter()
+        module = importlib.import_module(self.__name__)
+        get_lazy_import_times().setdefault(self.__name__, time.perf_counter() - started)
+        # Later lookups hit the real attributes directly
+        self.__dict__.update(module.__dict__)
+        return getattr(module, attr)
+
+def lazy_import(name):
+    return sys.modules.get(name) or _LazyModule(name)
+
+def is_dataframe(value):
+    # No DataFrame can exist until pandas has been imported, so don't import it just to check
+    return 'pandas' in sys.modules and isinstance(value, sys.modules['pandas'].DataFrame)
+
+pd = lazy_import("pandas")
+np = lazy_import("numpy")
+zipfile = lazy_import("zipfile")
+tempfile = lazy_import("tempfile")
 
 # DHL Brand Colors
 DHL_YELLOW = "#FFCC00"
@@ -113,6 +150,11 @@ st.markdown(f"""
         margin: 8px 0;
         border-radius: 5px;
     }}
+    .image-caption {{
+        color: rgba(49, 51, 63, 0.6);
+        font-size: 14px;
+        margin: 4px 0 12px 0;
+    }}
     
     /* Excel table styling */
     .excel-container {{
@@ -145,7 +187,7 @@ def init_session_state():
                 'kpi_font_size': 24,
                 'safety_news': [],
                 'team_news': [],
-                'ideas_actions': [],
+                'actions_store': new_actions_store(),
                 'additional_pages': {}
             },
             'Team WTH': {
@@ -154,7 +196,7 @@ def init_session_state():
                 'kpi_font_size': 24,
                 'safety_news': [],
                 'team_news': [],
-                'ideas_actions': [],
+                'actions_store': new_actions_store(),
                 'additional_pages': {}
             }
         }
@@ -169,6 +211,13 @@ def init_session_state():
     if 'screenshot_mode' not in st.session_state:
         st.session_state.screenshot_mode = False
 
+    if 'search_index' not in st.session_state:
+        st.session_state.search_index = build_search_index(st.session_state.team_data,
+                                                           st.session_state.available_pages)
+
+    if 'kpi_table' not in st.session_state:
+        st.session_state.kpi_table = build_kpi_rollup(st.session_state.team_data)
+
 # Helper functions for page navigation
 def get_next_page():
     current_idx = st.session_state.available_pages.index(st.session_state.current_page)
@@ -197,7 +246,9 @@ def add_new_page():
         st.session_state.team_data[team]['additional_pages'][new_page_name] = {
             'pictures': [],
             'picture_info': [],
-            'excel_files': []  # New field for Excel files
+            'excel_files': [],  # New field for Excel files
+            'charts': [],
+            'pivots': []
         }
     
     return new_page_name
@@ -209,6 +260,7 @@ def remove_page(page_name):
         for team in st.session_state.team_data:
             if page_name in st.session_state.team_data[team]['additional_pages']:
                 del st.session_state.team_data[team]['additional_pages'][page_name]
+        unindex_page(st.session_state.search_index, page_name)
         
         if st.session_state.current_page == page_name:
             st.session_state.current_page = "Dashboard"
@@ -216,19 +268,432 @@ def remove_page(page_name):
         return True
     return False
 
+# Ideas & Actions columnar store
+ACTION_STATUSES = ["In Progress", "Completed"]
+ACTION_STATUS_ICONS = {"In Progress": "🟡", "Completed": "✅"}
+ACTION_DATE_FORMATS = ["%Y-%m-%d", "%d.%m.%Y", "%d/%m/%Y", "%d-%m-%Y", "%d.%m.%y",
+                       "%d %B %Y", "%d %b %Y", "%B %d, %Y", "%b %d, %Y"]
+ACTION_VIEWS = ["All", "Overdue", "Due This Week", "By Owner", "By Status"]
+
+def parse_due_date(text):
+    """Parse the free-text 'Till When' field into a date (None if not a date)"""
+    text = (text or "").strip()
+    if not text:
+        return None
+    for fmt in ACTION_DATE_FORMATS:
+        try:
+            return datetime.strptime(text, fmt).date()
+        except ValueError:
+            continue
+    return None
+
+def new_actions_store():
+    """Create an empty columnar store for Ideas & Actions"""
+    return {
+        # One list per field, indexed by action id (rows are never reused)
+        'columns': {'idea': [], 'todo': [], 'who': [], 'when': [], 'due': [], 'status': []},
+        'order': [],      # live action ids in display order
+        'by_owner': {},   # owner -> set of action ids
+        'by_status': {},  # status code -> set of action ids
+        'by_due': [],     # sorted (due date ordinal, action id) for dated actions
+        'version': next_content_version()  # changes on every edit, keys the display cache
+    }
+
+def _index_action(store, aid):
+    columns = store['columns']
+    store['by_owner'].setdefault(columns['who'][aid], set()).add(aid)
+    store['by_status'].setdefault(columns['status'][aid], set()).add(aid)
+    if columns['due'][aid] is not None:
+        bisect.insort(store['by_due'], (columns['due'][aid].toordinal(), aid))
+
+def _unindex_action(store, aid):
+    columns = store['columns']
+    owner = columns['who'][aid]
+    store['by_owner'][owner].discard(aid)
+    if not store['by_owner'][owner]:
+        del store['by_owner'][owner]
+    store['by_status'][columns['status'][aid]].discard(aid)
+    if columns['due'][aid] is not None:
+        pos = bisect.bisect_left(store['by_due'], (columns['due'][aid].toordinal(), aid))
+        del store['by_due'][pos]
+
+def add_action(store, action):
+    """Append an action dict to the store and index it, returning its id"""
+    columns = store['columns']
+    aid = len(columns['idea'])
+    columns['idea'].append(action.get('idea', ''))
+    columns['todo'].append(action.get('todo', ''))
+    columns['who'].append(action.get('who', ''))
+    columns['when'].append(action.get('when', ''))
+    columns['due'].append(parse_due_date(action.get('when', '')))
+    status = action.get('status', 'In Progress')
+    columns['status'].append(ACTION_STATUSES.index(status) if status in ACTION_STATUSES else 0)
+    store['order'].append(aid)
+    _index_action(store, aid)
+    store['version'] = next_content_version()
+    return aid
+
+def update_action(store, aid, **fields):
+    """Update fields of an action, re-indexing only when an indexed field changed"""
+    columns = store['columns']
+    if 'status' in fields:
+        fields['status'] = ACTION_STATUSES.index(fields['status'])
+    if 'when' in fields:
+        fields['due'] = parse_due_date(fields['when'])
+    changed = {k: v for k, v in fields.items() if columns[k][aid] != v}
+    if not changed:
+        return False
+    reindex = any(k in changed for k in ('who', 'status', 'due'))
+    if reindex:
+        _unindex_action(store, aid)
+    for k, v in changed.items():
+        columns[k][aid] = v
+    if reindex:
+        _index_action(store, aid)
+    store['version'] = next_content_version()
+    return True
+
+def delete_action(store, aid):
+    """Remove an action from the live view and all indexes"""
+    _unindex_action(store, aid)
+    store['order'].remove(aid)
+    store['version'] = next_content_version()
+
+def get_action(store, aid):
+    """Return a single action as a plain dict"""
+    columns = store['columns']
+    return {
+        'idea': columns['idea'][aid],
+        'todo': columns['todo'][aid],
+        'who': columns['who'][aid],
+        'when': columns['when'][aid],
+        'due': columns['due'][aid],
+        'status': ACTION_STATUSES[columns['status'][aid]]
+    }
+
+def ensure_actions_store(team_data):
+    """Return the team's actions store, migrating the old list-of-dicts format if needed"""
+    if 'actions_store' not in team_data:
+        store = new_actions_store()
+        for action in team_data.pop('ideas_actions', []):
+            add_action(store, action)
+        team_data['actions_store'] = store
+    if 'version' not in team_data['actions_store']:
+        team_data['actions_store']['version'] = next_content_version()
+    return team_data['actions_store']
+
+def query_overdue(store, today=None):
+    """Open actions whose due date is before today, oldest first"""
+    today = today or datetime.now().date()
+    completed = store['by_status'].get(ACTION_STATUSES.index('Completed'), set())
+    end = bisect.bisect_left(store['by_due'], (today.toordinal(), -1))
+    return [aid for _, aid in store['by_due'][:end] if aid not in completed]
+
+def query_due_between(store, start, end):
+    """Actions due in [start, end], ordered by due date"""
+    lo = bisect.bisect_left(store['by_due'], (start.toordinal(), -1))
+    hi = bisect.bisect_right(store['by_due'], (end.toordinal(), float('inf')))
+    return [aid for _, aid in store['by_due'][lo:hi]]
+
+def query_due_this_week(store, today=None):
+    """Actions due between Monday and Sunday of the current week"""
+    today = today or datetime.now().date()
+    monday = today - timedelta(days=today.weekday())
+    return query_due_between(store, monday, monday + timedelta(days=6))
+
+def query_by_owner(store, owner):
+    """Actions owned by the given person, in display order"""
+    ids = store['by_owner'].get(owner, set())
+    return [aid for aid in store['order'] if aid in ids]
+
+def query_by_status(store, status):
+    """Actions with the given status, in display order"""
+    ids = store['by_status'].get(ACTION_STATUSES.index(status), set())
+    return [aid for aid in store['order'] if aid in ids]
+
+def actions_to_frame(store, ids):
+    """Build the Ideas & Actions display table for the given action ids"""
+    columns = store['columns']
+    labels = [f"{ACTION_STATUS_ICONS[s]} {s}" for s in ACTION_STATUSES]
+    return pd.DataFrame({
+        'Idea': [columns['idea'][aid] for aid in ids],
+        'To Do': [columns['todo'][aid] for aid in ids],
+        'Who': [columns['who'][aid] for aid in ids],
+        'Till When': [columns['when'][aid] for aid in ids],
+        'Due': pd.to_datetime([columns['due'][aid] for aid in ids]),
+        'Status': pd.Categorical.from_codes([columns['status'][aid] for aid in ids], categories=labels)
+    })
+
+# Full-text search index across all teams and pages
+SEARCH_TOKEN_RE = re.compile(r"\w+")
+SEARCH_KIND_LABELS = {
+    'safety': "🛡️ Safety",
+    'news': "📰 News",
+    'team_news': "👥 Team News",
+    'action': "💡 Action",
+    'picture_info': "📝 Content Info"
+}
+
+def tokenize(text):
+    return SEARCH_TOKEN_RE.findall(text.lower())
+
+def new_search_index():
+    """Create an empty inverted index"""
+    return {
+        'docs': {},        # doc key -> team, page, kind, text, length, terms
+        'postings': {},    # term -> {doc key: term frequency}
+        'terms': [],       # sorted vocabulary for prefix lookups
+        'total_length': 0
+    }
+
+def index_document(index, key, text, team, page, kind):
+    """Add or refresh one document; unchanged text is a no-op"""
+    doc = index['docs'].get(key)
+    if doc is not None and doc['text'] == text:
+        return False
+    if doc is not None:
+        unindex_document(index, key)
+    counts = Counter(tokenize(text))
+    for term, tf in counts.items():
+        posting = index['postings'].get(term)
+        if posting is None:
+            posting = index['postings'][term] = {}
+            bisect.insort(index['terms'], term)
+        posting[key] = tf
+    length = sum(counts.values())
+    index['docs'][key] = {'team': team, 'page': page, 'kind': kind, 'text': text,
+                          'length': length, 'terms': list(counts)}
+    index['total_length'] += length
+    return True
+
+def unindex_document(index, key):
+    """Remove one document and drop terms that no longer occur anywhere"""
+    doc = index['docs'].pop(key, None)
+    if doc is None:
+        return
+    for term in doc['terms']:
+        posting = index['postings'][term]
+        del posting[key]
+        if not posting:
+            del index['postings'][term]
+            del index['terms'][bisect.bisect_left(index['terms'], term)]
+    index['total_length'] -= doc['length']
+
+def unindex_page(index, page):
+    """Remove every document that belongs to a deleted page"""
+    for key in [k for k, doc in index['docs'].items() if doc['page'] == page]:
+        unindex_document(index, key)
+
+def search_key(team, page, kind, ref):
+    return (team, page, kind, ref)
+
+def action_search_text(store, aid):
+    columns = store['columns']
+    return " ".join([columns['idea'][aid], columns['todo'][aid], columns['who'][aid], columns['when'][aid]])
+
+def build_search_index(team_data, available_pages):
+    """Index every team's safety/news items, team news, actions and picture info"""
+    index = new_search_index()
+    for team, data in team_data.items():
+        for item in data.get('safety_news', []):
+            index_document(index, search_key(team, "Dashboard", 'safety_news', id(item)), item['content'],
+                           team, "Dashboard", item['type'].lower())
+        for item in data.get('team_news', []):
+            index_document(index, search_key(team, "Dashboard", 'team_news', id(item)), item['content'],
+                           team, "Dashboard", 'team_news')
+        store = ensure_actions_store(data)
+        for aid in store['order']:
+            index_document(index, search_key(team, "Dashboard", 'action', aid), action_search_text(store, aid),
+                           team, "Dashboard", 'action')
+        pages = {"Additional Content": data}
+        pages.update(data.get('additional_pages', {}))
+        for page, page_data in pages.items():
+            if page not in available_pages:
+                continue
+            for item in page_data.get('picture_info', []):
+                index_document(index, search_key(team, page, 'picture_info', id(item)), item['content'],
+                               team, page, 'picture_info')
+    return index
+
+def _expand_prefix(index, token):
+    terms = index['terms']
+    lo = bisect.bisect_left(terms, token)
+    hi = bisect.bisect_left(terms, token + "\uffff")
+    return terms[lo:hi]
+
+def search_boards(index, query, limit=20):
+    """Rank documents matching every query word (prefix match), best first"""
+    tokens = tokenize(query)
+    if not tokens or not index['docs']:
+        return []
+    n_docs = len(index['docs'])
+    avg_length = index['total_length'] / n_docs or 1
+    scores = None
+    for token in tokens:
+        token_scores = {}
+        for term in _expand_prefix(index, token):
+            posting = index['postings'][term]
+            # BM25 weighting; prefix completions count half as much as exact words
+            idf = math.log(1 + (n_docs - len(posting) + 0.5) / (len(posting) + 0.5))
+            boost = 1.0 if term == token else 0.5
+            for key, tf in posting.items():
+                length = index['docs'][key]['length']
+                score = boost * idf * tf * 2.2 / (tf + 1.2 * (0.25 + 0.75 * length / avg_length))
+                token_scores[key] = max(token_scores.get(key, 0.0), score)
+        if scores is None:
+            scores = token_scores
+        else:
+            scores = {key: score + token_scores[key] for key, score in scores.items() if key in token_scores}
+        if not scores:
+            return []
+    top = heapq.nlargest(limit, scores.items(), key=lambda kv: kv[1])
+    return [(index['docs'][key], score) for key, score in top]
+
+def open_search_result(team, page):
+    st.session_state.selected_team = team
+    st.session_state.current_page = page
+
+# Display preparation: compact frames and cache their Arrow form by content version
+DISPLAY_CACHE_ENTRIES = 256
+CATEGORY_MAX_UNIQUE = 1000
+CATEGORY_MAX_RATIO = 0.5  # convert text to categorical when at most half the values are distinct
+
+pa = lazy_import("pyarrow")
+
+@st.cache_resource
+def _get_version_counter():
+    return itertools.count(1)
+
+def next_content_version():
+    """Process-wide unique version number for in-memory content"""
+    return next(_get_version_counter())
+
+def frame_version(excel_info):
+    """Content version of a parsed sheet (older entries are hashed on demand)"""
+    if 'version' not in excel_info:
+        excel_info['version'] = str(pd.util.hash_pandas_object(excel_info['data'], index=False).sum())
+    return excel_info['version']
+
+def stringify_mixed(col):
+    """Text for every cell of an object column mixing types (e.g. numbers and text in one Excel column)"""
+    if col.dtype == object and pd.api.types.infer_dtype(col, skipna=True).startswith('mixed'):
+        return col.where(col.isna(), col.astype(str))
+    return col
+
+def compact_for_display(df, columns=None, drop_empty=False):
+    """Downcast numerics, categorize repetitive text and keep only the displayed columns"""
+    if columns is not None:
+        df = df[list(columns)]
+    compacted = {}
+    for name, col in df.items():
+        if drop_empty and col.isna().all():
+            continue
+        if pd.api.types.is_bool_dtype(col):
+            pass
+        elif pd.api.types.is_integer_dtype(col):
+            col = pd.to_numeric(col, downcast='integer')
+        elif pd.api.types.is_float_dtype(col):
+            col = pd.to_numeric(col, downcast='float')
+        elif col.dtype == object or pd.api.types.is_string_dtype(col.dtype):
+            # Mixed cells can't go to Arrow as-is
+            col = stringify_mixed(col)
+            unique = col.nunique(dropna=True)
+            if unique <= CATEGORY_MAX_UNIQUE and unique <= len(col) * CATEGORY_MAX_RATIO:
+                col = col.astype('category')
+        compacted[str(name)] = col
+    return pd.DataFrame(compacted, index=df.index)
+
+@st.cache_resource(max_entries=DISPLAY_CACHE_ENTRIES)
+def _cached_display_table(version, columns, drop_empty, _build):
+    df = compact_for_display(_build(), columns, drop_empty)
+    return pa.Table.from_pandas(df, preserve_index=False)
+
+def display_table(version, build, columns=None, drop_empty=False):
+    """Arrow table ready for st.dataframe; build() is only called on a cache miss"""
+    return _cached_display_table(version, tuple(columns) if columns is not None else None, drop_empty, build)
+
+# Media: images published once under a content-hash URL the browser can keep caching.
+# Streamlit's static route sends no Cache-Control; since a URL's content never changes,
+# the reverse proxy in front of the app should add "Cache-Control: public, max-age=31536000,
+# immutable" for /app/static/media/ (see .streamlit/config.toml).
+MEDIA_URL_PATH = "app/static/media"
+MEDIA_SIGNATURES = [(b'\x89PNG\r\n\x1a\n', 'png'), (b'\xff\xd8\xff', 'jpg'), (b'GIF8', 'gif')]
+
+def get_media_dir():
+    """static/media next to this script; mount it on shared storage so every replica serves the same files"""
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static", "media")
+    os.makedirs(path, exist_ok=True)
+    return path
+
+class ContentBytes(bytes):
+    """File content that carries its SHA-256 (restored and reloaded images), so it is never re-hashed"""
+    def __new__(cls, data, digest):
+        content = super().__new__(cls, data)
+        content.digest = digest
+        return content
+
+@st.cache_resource
+def _get_media_urls():
+    """Upload id or content digest -> published URL, so a picture is hashed only once per process"""
+    return {}
+
+def publish_media(image):
+    """Stable URL of an uploaded or restored image, or None when it can't be served statically"""
+    if not st.get_option("server.enableStaticServing"):
+        return None
+    key = getattr(image, 'file_id', None) or getattr(image, 'digest', None)
+    urls = _get_media_urls()
+    if key in urls:
+        return urls[key]
+    data = image if isinstance(image, bytes) else image.getvalue()
+    extension = next((ext for signature, ext in MEDIA_SIGNATURES if data.startswith(signature)), None)
+    if extension is None:
+        return None
+    digest = getattr(image, 'digest', None) or hashlib.sha256(data).hexdigest()
+    name = f"{digest}.{extension}"
+    path = os.path.join(get_media_dir(), name)
+    if not os.path.exists(path):
+        # Write then rename, so a concurrent reader never sees a partial file
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temp_path, 'wb') as f:
+            f.write(data)
+        os.replace(temp_path, path)
+    url = f"{MEDIA_URL_PATH}/{name}"
+    if key is not None:
+        urls[key] = url
+    return url
+
+def show_image(image, width, caption=None):
+    """Render an image by URL so an unchanged picture is never re-sent to a browser that has it"""
+    url = publish_media(image)
+    if url is None:
+        st.image(image, width=width, caption=caption)
+        return
+    caption_html = f'<div class="image-caption">{html.escape(caption)}</div>' if caption else ""
+    st.markdown(f'<img src="{url}" width="{width}" style="max-width: 100%;" alt="{html.escape(caption or "")}">{caption_html}',
+                unsafe_allow_html=True)
+
 # Excel processing function
-def process_excel_file(excel_file, max_rows=25):
-    """Process Excel file and return first sheet with header and top rows"""
+EXCEL_PREVIEW_ROWS = 25
+def process_excel_file(excel_file, max_rows=None, file_hash=None):
+    """Process Excel file and return its first sheet (all rows unless max_rows is given)"""
     try:
         # Read Excel file
         df = pd.read_excel(excel_file, nrows=max_rows)
         
+        # Per-row hashes identify unchanged rows between versions of the same workbook
+        row_hashes = pd.util.hash_pandas_object(df, index=False).to_numpy()
+        
         # Get basic info
         file_info = {
             'filename': excel_file.name,
             'shape': df.shape,
             'columns': list(df.columns),
-            'data': df
+            'data': df,
+            'file_hash': file_hash or hashlib.sha256(excel_file.getvalue()).hexdigest(),
+            'row_hashes': row_hashes.tobytes(),
+            # Content version: a re-saved file with identical data keeps the same version
+            'version': hashlib.sha256(repr([str(c) for c in df.columns]).encode() + row_hashes.tobytes()).hexdigest()
         }
         
         return file_info
@@ -236,6 +701,386 @@ def process_excel_file(excel_file, max_rows=25):
         st.error(f"Error processing Excel file: {str(e)}")
         return None
 
+# CSV/TSV processing: stream oversized extracts in chunks instead of loading them whole
+CSV_TYPES = ['csv', 'tsv']
+CSV_CHUNK_ROWS = 100_000
+CSV_SAMPLE_ROWS = 200
+CSV_TOP_VALUES = 5
+CSV_TOP_TRACKED = 200  # Misra-Gries counters kept per column for the top values
+
+def is_csv_upload(uploaded_file):
+    return uploaded_file.name.lower().rsplit('.', 1)[-1] in CSV_TYPES
+
+def _new_column_stats():
+    return {'count': 0, 'nulls': 0, 'numeric': True, 'sum': 0.0, 'min': None, 'max': None,
+            'top': None, 'top_error': 0}
+
+def _update_column_stats(stats, col):
+    values = col.dropna()
+    stats['count'] += len(values)
+    stats['nulls'] += len(col) - len(values)
+    if stats['numeric'] and len(values):
+        numbers = pd.to_numeric(values, errors='coerce')
+        if numbers.isna().any():
+            stats['numeric'] = False
+        else:
+            stats['sum'] += float(numbers.sum())
+            low, high = float(numbers.min()), float(numbers.max())
+            stats['min'] = low if stats['min'] is None else min(stats['min'], low)
+            stats['max'] = high if stats['max'] is None else max(stats['max'], high)
+    # Misra-Gries summary, merged a chunk at a time: when more than CSV_TOP_TRACKED values are
+    # counted, the next-largest count is subtracted from all of them and values at 0 dropped.
+    # Counts are lower bounds, off by at most top_error; any value seen more than
+    # rows / (CSV_TOP_TRACKED + 1) times is guaranteed to be kept.
+    counts = values.value_counts()
+    top = counts if stats['top'] is None else stats['top'].add(counts, fill_value=0)
+    if len(top) > CSV_TOP_TRACKED:
+        cut = top.nlargest(CSV_TOP_TRACKED + 1).iloc[-1]
+        top = top[top > cut] - cut
+        stats['top_error'] += cut
+    stats['top'] = top
+
+def _finish_column_stats(name, stats, rows):
+    top = stats['top'].nlargest(CSV_TOP_VALUES).items() if stats['top'] is not None else []
+    bound = "≥" if stats['top_error'] else ""
+    numeric = stats['numeric'] and stats['count'] > 0
+    return {
+        'Column': str(name),
+        'Count': stats['count'],
+        'Null %': round(100 * stats['nulls'] / rows, 1) if rows else 0.0,
+        'Min': stats['min'] if numeric else None,
+        'Max': stats['max'] if numeric else None,
+        'Mean': stats['sum'] / stats['count'] if numeric else None,
+        'Top values (approx.)': ", ".join(f"{value} ({bound}{int(n)})" for value, n in top if n > 1)
+    }
+
+def process_csv_file(csv_file, chunk_rows=CSV_CHUNK_ROWS, sample_rows=CSV_SAMPLE_ROWS, file_hash=None):
+    """Stream a CSV/TSV file once, returning column statistics and a random sample of rows"""
+    try:
+        csv_file.seek(0)
+        sep = '\t' if csv_file.name.lower().endswith('.tsv') else ','
+        rng = np.random.default_rng()
+        column_stats = {}
+        reservoir = []  # one-row frames
+        rows = 0
+        for chunk in pd.read_csv(csv_file, sep=sep, chunksize=chunk_rows, encoding_errors='replace'):
+            for name, col in chunk.items():
+                _update_column_stats(column_stats.setdefault(name, _new_column_stats()), col)
+            # Reservoir sampling: every row ends up in the sample with equal probability
+            fill = min(max(sample_rows - rows, 0), len(chunk))
+            reservoir.extend(chunk.iloc[[offset]] for offset in range(fill))
+            if fill < len(chunk):
+                offsets = np.arange(fill, len(chunk))
+                slots = rng.integers(0, rows + offsets + 1)
+                hits = slots < sample_rows
+                # Later rows win a contested slot, as in the sequential algorithm
+                for slot, offset in dict(zip(slots[hits].tolist(), offsets[hits].tolist())).items():
+                    reservoir[slot] = chunk.iloc[[offset]]
+            rows += len(chunk)
+        sample = pd.concat(reservoir, ignore_index=True) if reservoir else pd.DataFrame()
+        file_hash = file_hash or hashlib.sha256(csv_file.getvalue()).hexdigest()
+        return {
+            'filename': csv_file.name,
+            'kind': 'csv',
+            'shape': (rows, len(column_stats)),
+            'columns': list(column_stats),
+            'data': sample,
+            'stats': [_finish_column_stats(name, stats, rows) for name, stats in column_stats.items()],
+            'file_hash': file_hash,
+            'version': file_hash  # statistics and sample are random, so the file itself is the version
+        }
+    except Exception as e:
+        st.error(f"Error processing CSV file: {str(e)}")
+        return None
+
+# Workbook versions: recognise re-uploads of the same report and diff them row by row
+def is_new_version_of(previous, excel_info):
+    """Same file name and sheet schema as the workbook already in the slot"""
+    return previous is not None and 'row_hashes' in previous and \
+        previous['filename'] == excel_info['filename'] and \
+        [str(c) for c in previous['columns']] == [str(c) for c in excel_info['columns']]
+
+def diff_workbook_rows(previous, excel_info):
+    """Added, changed and removed rows between two versions of a sheet.
+
+    Rows are matched on the first column when it is a unique, complete key in
+    both versions; otherwise rows are matched by content only (no 'changed').
+    """
+    old_df, new_df = previous['data'], excel_info['data']
+    old_hashes = np.frombuffer(previous['row_hashes'], dtype=np.uint64)
+    new_hashes = np.frombuffer(excel_info['row_hashes'], dtype=np.uint64)
+    key = new_df.columns[0] if len(new_df.columns) else None
+    keyed = key is not None and all(df[key].is_unique and df[key].notna().all() for df in (old_df, new_df))
+    added, changed, changed_before = [], [], []
+    if keyed:
+        old_positions = dict(zip(old_df[key], range(len(old_df))))
+        for pos, (row_key, row_hash) in enumerate(zip(new_df[key], new_hashes)):
+            old_pos = old_positions.pop(row_key, None)
+            if old_pos is None:
+                added.append(pos)
+            elif old_hashes[old_pos] != row_hash:
+                changed.append(pos)
+                changed_before.append(old_pos)
+        removed = sorted(old_positions.values())
+    else:
+        unmatched = {}
+        for pos, row_hash in enumerate(old_hashes.tolist()):
+            unmatched.setdefault(row_hash, []).append(pos)
+        for pos, row_hash in enumerate(new_hashes.tolist()):
+            if unmatched.get(row_hash):
+                unmatched[row_hash].pop()
+            else:
+                added.append(pos)
+        removed = sorted(pos for positions in unmatched.values() for pos in positions)
+    return {
+        'previous_version': previous['version'],
+        'key': str(key) if keyed else None,
+        'added': added,
+        'changed': changed,
+        'changed_before': old_df.iloc[changed_before],  # previous content of the changed rows
+        'removed_rows': old_df.iloc[removed]
+    }
+
+def ingest_excel_upload(uploaded_excel, previous):
+    """Process an upload for a slot, returning (excel_info, is_new).
+
+    The same upload seen again on a rerun is not re-parsed. A new version of
+    the slot's workbook gets a row diff, and keeps the old content version
+    (so every cache keyed on it stays warm) when no row actually changed.
+    """
+    # The widget hands back the same upload on every rerun: recognise it by id before hashing it
+    upload_id = getattr(uploaded_excel, 'file_id', None)
+    if previous is not None and upload_id is not None and previous.get('upload_id') == upload_id:
+        return previous, False
+    file_hash = hashlib.sha256(uploaded_excel.getvalue()).hexdigest()
+    if previous is not None and previous.get('file_hash') == file_hash:
+        previous['upload_id'] = upload_id
+        return previous, False
+    if is_csv_upload(uploaded_excel):
+        excel_info = process_csv_file(uploaded_excel, file_hash=file_hash)
+    else:
+        excel_info = process_excel_file(uploaded_excel, file_hash=file_hash)
+    if excel_info is None:
+        return None, False
+    excel_info['upload_id'] = upload_id
+    if excel_info.get('kind') == 'csv':
+        return excel_info, True
+    if is_new_version_of(previous, excel_info) and excel_info['version'] != previous['version']:
+        excel_info['diff'] = diff_workbook_rows(previous, excel_info)
+    return excel_info, True
+
+def describe_diff(diff):
+    return f"🟢 {len(diff['added'])} added · 🟡 {len(diff['changed'])} changed · 🔴 {len(diff['removed_rows'])} removed"
+
+def changed_positions(diff):
+    """Positions of the added and changed rows in the new version"""
+    return sorted(diff['added'] + diff['changed'])
+
+def frame_with_changes(excel_info):
+    """Sheet preview with a leading 'Change' column marking added and changed rows"""
+    df = excel_info['data']
+    diff = excel_info.get('diff')
+    if not diff:
+        return df
+    change = pd.Series("", index=df.index)
+    change.iloc[diff['added']] = "🟢 Added"
+    change.iloc[diff['changed']] = "🟡 Changed"
+    return pd.concat([change.rename("Change"), df], axis=1)
+
+# Charts: downsample long series to what a chart can actually show
+CHART_MAX_POINTS = 2000
+CHART_KINDS = ["Line", "Bar", "Scatter"]
+CHART_ROW_AXIS = "(row number)"
+
+def lttb_indices(x, y, threshold):
+    """Largest-Triangle-Three-Buckets: positions of the points that best keep a line's shape"""
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+    edges = np.linspace(1, n - 1, threshold - 1).astype(int)
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], max(edges[i + 1], edges[i] + 1)
+        # Average of the next bucket (the last point for the final bucket)
+        if i + 2 < len(edges):
+            next_end = max(edges[i + 2], end + 1)
+            avg_x, avg_y = x[end:next_end].mean(), y[end:next_end].mean()
+        else:
+            avg_x, avg_y = x[-1], y[-1]
+        area = np.abs((x[a] - avg_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (avg_y - y[a]))
+        a = start + int(area.argmax())
+        selected[i + 1] = a
+    return selected
+
+def minmax_indices(values, threshold):
+    """Positions of each bucket's minimum and maximum in every column (keeps spikes of all series)"""
+    n = len(values)
+    buckets = max(threshold // (2 * max(values.shape[1], 1)), 1)
+    bucket = pd.Series(np.arange(n) * buckets // n)
+    keep = {0, n - 1}
+    for name in values.columns:
+        col = pd.Series(values[name].to_numpy(), index=bucket.index).dropna()
+        groups = col.groupby(bucket[col.index])
+        keep.update(groups.idxmin())
+        keep.update(groups.idxmax())
+    return np.array(sorted(keep))
+
+def downsample_indices(x, values, max_points):
+    """Row positions to plot: all of them for short series, LTTB or min/max buckets otherwise"""
+    if len(values) <= max_points:
+        return np.arange(len(values))
+    if values.shape[1] == 1 and not values.iloc[:, 0].isna().any():
+        return lttb_indices(x, values.iloc[:, 0].to_numpy(dtype=float), max_points)
+    return minmax_indices(values, max_points)
+
+def chart_frame(df, x_col, y_cols, max_points=CHART_MAX_POINTS):
+    """Plot-ready frame: x column plus numeric y columns, ordered by x and downsampled"""
+    values = pd.DataFrame({str(c): pd.to_numeric(df[c], errors='coerce') for c in y_cols})
+    x_name = CHART_ROW_AXIS if x_col is None else str(x_col)
+    while x_name in values.columns:
+        # A value column of the same name (e.g. one literally called "(row number)")
+        x_name += " (x axis)"
+    x = pd.Series(np.arange(len(df)), index=df.index) if x_col is None else df[x_col]
+    ordered = pd.api.types.is_numeric_dtype(x) or pd.api.types.is_datetime64_any_dtype(x)
+    keep = values.notna().any(axis=1) & (x.notna() if ordered else True)
+    values, x = values[keep], x[keep]
+    if ordered:
+        if pd.api.types.is_datetime64_any_dtype(x):
+            naive = x.dt.tz_convert(None) if x.dt.tz is not None else x
+            x_numeric = naive.to_numpy().view('int64').astype(float)
+        else:
+            x_numeric = x.to_numpy(dtype=float)
+        order = np.argsort(x_numeric, kind='stable')
+        values, x, x_numeric = values.iloc[order], x.iloc[order], x_numeric[order]
+    else:
+        x_numeric = np.arange(len(x), dtype=float)
+    positions = downsample_indices(x_numeric, values, max_points)
+    result = values.iloc[positions].reset_index(drop=True)
+    result.insert(0, x_name, x.iloc[positions].reset_index(drop=True))
+    return result
+
+@st.cache_resource(max_entries=DISPLAY_CACHE_ENTRIES)
+def _cached_chart_data(version, x_col, y_cols, max_points, _df):
+    columns = {str(c): c for c in _df.columns}
+    return chart_frame(_df, None if x_col is None else columns[x_col], [columns[c] for c in y_cols], max_points)
+
+def chart_data(excel_info, chart, max_points=CHART_MAX_POINTS):
+    """Downsampled data for a saved chart, computed once per sheet version; None if its columns are gone"""
+    columns = {str(c) for c in excel_info['columns']}
+    if not chart['y'] or any(c not in columns for c in chart['y']) or chart['x'] not in columns | {None}:
+        return None
+    return _cached_chart_data(frame_version(excel_info), chart['x'], tuple(chart['y']), max_points, excel_info['data'])
+
+def next_item_id(items):
+    """Id for a new chart or pivot, unique within its page; widget keys use it instead of the position"""
+    return max((item.get('id', 0) for item in items), default=0) + 1
+
+def numeric_columns(excel_info):
+    return [str(c) for c in excel_info['data'].columns if pd.api.types.is_numeric_dtype(excel_info['data'][c])]
+
+# Pivots: group-by summaries over the full sheet, cached per sheet version
+PIVOT_AGGREGATIONS = {"Sum": 'sum', "Mean": 'mean', "Min": 'min', "Max": 'max', "Count": 'count'}
+
+def group_by_sheet(df, by, values, agg):
+    """Row count per group plus the chosen aggregation of each value column"""
+    columns = {str(c): c for c in df.columns}
+    keys = [df[columns[c]].rename(c) for c in by]
+    result = df.groupby(keys, dropna=False, observed=True).size().rename("Rows").to_frame()
+    func = PIVOT_AGGREGATIONS[agg]
+    for name in values:
+        column = df[columns[name]]
+        if func != 'count':
+            column = pd.to_numeric(column, errors='coerce')
+        result[f"{agg} of {name}"] = column.groupby(keys, dropna=False, observed=True).agg(func)
+    return result.reset_index()
+
+PIVOT_CACHE_ENTRIES = 256
+PIVOT_INCREMENTAL = {"Sum", "Count"}  # aggregations a row diff can be applied to
+
+@st.cache_resource
+def _get_pivot_frames():
+    """(sheet version, group keys, value columns, aggregation) -> grouped frame, least recently used first"""
+    return {'frames': {}, 'lock': threading.Lock()}
+
+def _apply_diff_to_pivot(previous, excel_info, pivot):
+    """Update the previous version's Sum/Count pivot with only the rows the diff touched"""
+    diff = excel_info['diff']
+    by, values, agg = pivot['by'], pivot['values'], pivot['agg']
+    new_rows = excel_info['data'].iloc[changed_positions(diff)]
+    old_rows = pd.concat([diff['removed_rows'], diff['changed_before']])
+    result = previous.set_index(by)
+    result = result.add(group_by_sheet(new_rows, by, values, agg).set_index(by), fill_value=0)
+    result = result.sub(group_by_sheet(old_rows, by, values, agg).set_index(by), fill_value=0)
+    result = result[result['Rows'] > 0]
+    for name, dtype in previous.dtypes.items():
+        if name in result.columns and pd.api.types.is_integer_dtype(dtype):
+            result[name] = result[name].round().astype(dtype)
+    try:
+        result = result.sort_index()
+    except TypeError:
+        pass  # group keys of mixed types keep their order
+    return result.reset_index()
+
+def pivot_frame(excel_info, pivot):
+    """Grouped frame for a pivot; a Sum/Count pivot of a new sheet version is derived from
+    the previous version's result when that is cached, other pivots are recomputed"""
+    cache = _get_pivot_frames()
+    rest = (tuple(pivot['by']), tuple(pivot['values']), pivot['agg'])
+    key = (frame_version(excel_info),) + rest
+    with cache['lock']:
+        frame = cache['frames'].pop(key, None)
+        diff = excel_info.get('diff')
+        previous = cache['frames'].get((diff['previous_version'],) + rest) \
+            if diff and 'changed_before' in diff and pivot['agg'] in PIVOT_INCREMENTAL else None
+    if frame is None and previous is not None:
+        frame = _apply_diff_to_pivot(previous, excel_info, pivot)
+    elif frame is None:
+        frame = group_by_sheet(excel_info['data'], pivot['by'], pivot['values'], pivot['agg'])
+    with cache['lock']:
+        cache['frames'][key] = frame
+        while len(cache['frames']) > PIVOT_CACHE_ENTRIES:
+            cache['frames'].pop(next(iter(cache['frames'])))
+    return frame
+
+def pivot_sources(page_data):
+    """Slots holding a fully loaded sheet (streamed CSV extracts only keep a sample)"""
+    return [i for i, e in enumerate(page_data['excel_files']) if e is not None and e.get('kind') != 'csv']
+
+def pivot_table(excel_info, pivot):
+    """Arrow table for a saved pivot, aggregated once per (sheet version, group keys, measures)"""
+    columns = {str(c) for c in excel_info['columns']}
+    if not pivot['by'] or any(c not in columns for c in pivot['by'] + pivot['values']):
+        return None
+    key = (frame_version(excel_info), 'pivot', tuple(pivot['by']), tuple(pivot['values']), pivot['agg'])
+    return display_table(key, lambda: pivot_frame(excel_info, pivot))
+
+def sheet_preview_table(excel_info):
+    """First rows of a sheet with change markers, added and changed rows first, as a cached Arrow table"""
+    diff = excel_info.get('diff')
+
+    def build():
+        frame = frame_with_changes(excel_info)
+        if diff:
+            marked = changed_positions(diff)[:EXCEL_PREVIEW_ROWS]
+            skip = set(marked)
+            rest = [p for p in range(min(len(frame), 2 * EXCEL_PREVIEW_ROWS)) if p not in skip]
+            frame = frame.iloc[marked + rest]
+        return frame.head(EXCEL_PREVIEW_ROWS)
+    return display_table((frame_version(excel_info), diff['previous_version'] if diff else None), build, drop_empty=True)
+
+def changed_rows_table(excel_info):
+    """Every added and changed row of a new sheet version, as a cached Arrow table"""
+    diff = excel_info['diff']
+    return display_table((frame_version(excel_info), diff['previous_version'], 'changes'),
+                         lambda: frame_with_changes(excel_info).iloc[changed_positions(diff)], drop_empty=True)
+
+def csv_tables(excel_info):
+    """Column statistics and sampled rows of a streamed extract, as cached Arrow tables"""
+    return (display_table((excel_info['version'], 'stats'), lambda: pd.DataFrame(excel_info['stats'])),
+            display_table(excel_info['version'], lambda: excel_info['data']))
+
 # Screenshot export function
 def create_manual_screenshot_guide(team_name, available_pages):
     """Create a text guide for manual screenshots"""
@@ -277,6 +1122,660 @@ Generated on: {datetime.now().strftime('%B %d, %Y at %H:%M')}
     
     return guide_content
 
+# Board snapshots: JSON manifest plus content-addressed blobs in a ZIP
+SNAPSHOT_FORMAT = "dhl-board-snapshot"
+SNAPSHOT_VERSION = 1
+SNAPSHOT_CHUNK_SIZE = 1024 * 1024
+SNAPSHOT_SPOOL_SIZE = 16 * 1024 * 1024  # larger snapshots spill to a temp file
+
+def _frame_to_bytes(df):
+    buffer = io.BytesIO()
+    pd.DataFrame({str(name): stringify_mixed(col) for name, col in df.items()}).to_parquet(buffer, index=False)
+    return buffer.getvalue()
+
+def _json_default(value):
+    # numpy scalars from column statistics, anything else (e.g. a Timestamp header) as text
+    return value.item() if isinstance(value, np.generic) else str(value)
+
+def _write_blob(zf, written, data, compress):
+    """Write bytes once under their SHA-256 and return the digest"""
+    digest = hashlib.sha256(data).hexdigest()
+    if digest not in written:
+        info = zipfile.ZipInfo(f"blobs/{digest}", date_time=(1980, 1, 1, 0, 0, 0))
+        info.compress_type = zipfile.ZIP_DEFLATED if compress else zipfile.ZIP_STORED
+        with zf.open(info, 'w') as blob:
+            for start in range(0, len(data), SNAPSHOT_CHUNK_SIZE):
+                blob.write(data[start:start + SNAPSHOT_CHUNK_SIZE])
+        written.add(digest)
+    return digest
+
+def _encode_board_value(zf, written, key, value):
+    if hasattr(value, 'getvalue'):
+        # UploadedFile (images are already compressed, store them as-is)
+        return {'$blob': _write_blob(zf, written, value.getvalue(), False), 'kind': 'file',
+                'name': getattr(value, 'name', None)}
+    if isinstance(value, bytes):
+        return {'$blob': _write_blob(zf, written, value, False), 'kind': 'file'}
+    if is_dataframe(value):
+        return {'$blob': _write_blob(zf, written, _frame_to_bytes(value), True), 'kind': 'frame'}
+    if key == 'columns':
+        return [str(c) for c in value]
+    if key == 'actions_store':
+        actions = [get_action(value, aid) for aid in value['order']]
+        for action in actions:
+            del action['due']
+        return {'$actions': actions}
+    if isinstance(value, dict):
+        return {k: _encode_board_value(zf, written, k, v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_encode_board_value(zf, written, None, v) for v in value]
+    return value
+
+def write_snapshot(fileobj, team_data, available_pages, teams=None):
+    """Stream the selected teams' boards (all teams by default) into a snapshot ZIP"""
+    teams = teams or list(team_data)
+    written = set()
+    with zipfile.ZipFile(fileobj, 'w', zipfile.ZIP_DEFLATED) as zf:
+        boards = {team: _encode_board_value(zf, written, None, team_data[team]) for team in teams}
+        manifest = {
+            'format': SNAPSHOT_FORMAT,
+            'version': SNAPSHOT_VERSION,
+            'created': datetime.now().isoformat(timespec='seconds'),
+            'available_pages': list(available_pages),
+            'blobs': len(written),
+            'teams': boards
+        }
+        zf.writestr("manifest.json", json.dumps(manifest, ensure_ascii=False, default=_json_default))
+    return manifest
+
+def _decode_board_value(zf, blobs, value):
+    if isinstance(value, dict):
+        if '$blob' in value:
+            digest = value['$blob']
+            if digest not in blobs:
+                data = zf.read(f"blobs/{digest}")
+                if hashlib.sha256(data).hexdigest() != digest:
+                    raise ValueError(f"Snapshot blob {digest[:12]} is corrupted")
+                blobs[digest] = pd.read_parquet(io.BytesIO(data)) if value['kind'] == 'frame' else ContentBytes(data, digest)
+            return blobs[digest]
+        if '$actions' in value:
+            store = new_actions_store()
+            for action in value['$actions']:
+                add_action(store, action)
+            return store
+        decoded = {k: _decode_board_value(zf, blobs, v) for k, v in value.items()}
+        if 'shape' in decoded and 'data' in decoded:
+            decoded['shape'] = tuple(decoded['shape'])
+        return decoded
+    if isinstance(value, list):
+        return [_decode_board_value(zf, blobs, v) for v in value]
+    return value
+
+def read_snapshot(fileobj):
+    """Read a snapshot ZIP, returning (boards by team, available pages)"""
+    with zipfile.ZipFile(fileobj) as zf:
+        manifest = json.loads(zf.read("manifest.json"))
+        if manifest.get('format') != SNAPSHOT_FORMAT or manifest.get('version', 0) > SNAPSHOT_VERSION:
+            raise ValueError("Not a supported dashboard snapshot")
+        blobs = {}  # shared across teams so identical files are loaded once
+        boards = {team: _decode_board_value(zf, blobs, board) for team, board in manifest['teams'].items()}
+    return boards, manifest['available_pages']
+
+def export_snapshot_bytes(team_data, available_pages, teams=None):
+    with tempfile.SpooledTemporaryFile(max_size=SNAPSHOT_SPOOL_SIZE) as spool:
+        write_snapshot(spool, team_data, available_pages, teams)
+        spool.seek(0)
+        return spool.read()
+
+def restore_snapshot(fileobj, rename=None):
+    """Load boards from a snapshot into the session, optionally renaming a single team"""
+    boards, pages = read_snapshot(fileobj)
+    if rename:
+        boards = {rename: board for board in boards.values()}
+    return merge_boards(boards, pages)
+
+def merge_boards(boards, pages):
+    """Add boards and their pages to the session, replacing teams of the same name"""
+    for page in pages:
+        if page not in st.session_state.available_pages:
+            st.session_state.available_pages.append(page)
+    st.session_state.team_data.update(boards)
+    for team in boards:
+        _reset_board_widgets(team)
+    extra_pages = [p for p in st.session_state.available_pages if p not in ['Dashboard', 'Additional Content']]
+    for data in st.session_state.team_data.values():
+        data.setdefault('additional_pages', {})
+        for page in extra_pages:
+            data['additional_pages'].setdefault(page, {'pictures': [], 'picture_info': [], 'excel_files': [],
+                                                     'charts': [], 'pivots': []})
+    st.session_state.search_index = build_search_index(st.session_state.team_data,
+                                                       st.session_state.available_pages)
+    st.session_state.kpi_table = build_kpi_rollup(st.session_state.team_data)
+    return list(boards)
+
+def clone_team_board(source_team, new_team):
+    """Copy a team's board to a new team through an in-memory snapshot"""
+    with tempfile.SpooledTemporaryFile(max_size=SNAPSHOT_SPOOL_SIZE) as spool:
+        write_snapshot(spool, st.session_state.team_data, st.session_state.available_pages, [source_team])
+        spool.seek(0)
+        return restore_snapshot(spool, rename=new_team)
+
+# Warm-up: parse persisted boards and fill the shared caches before traffic arrives
+BOARDS_DIR = os.environ.get("DASHBOARD_BOARDS_DIR")  # snapshot ZIPs every new session starts from
+WARMUP_WORKERS = int(os.environ.get("DASHBOARD_WARMUP_WORKERS", 4))
+
+def list_persisted_boards():
+    """Snapshot ZIPs in the boards directory, oldest first so newer files win on merge"""
+    if not BOARDS_DIR or not os.path.isdir(BOARDS_DIR):
+        return []
+    paths = [os.path.join(BOARDS_DIR, name) for name in os.listdir(BOARDS_DIR) if name.endswith('.zip')]
+    return sorted(paths, key=os.path.getmtime)
+
+def warm_board(board):
+    """Publish a board's images and build the tables and charts its pages display"""
+    if board.get('performance_image') is not None:
+        publish_media(board['performance_image'])
+    # Additional Content keeps its fields on the board itself
+    for page in [board] + list(board.get('additional_pages', {}).values()):
+        for picture in page.get('pictures', []):
+            if picture is not None:
+                publish_media(picture)
+        excel_files = page.get('excel_files', [])
+        for excel_info in excel_files:
+            if excel_info is None:
+                pass
+            elif excel_info.get('kind') == 'csv':
+                csv_tables(excel_info)
+            else:
+                sheet_preview_table(excel_info)
+        for chart in page.get('charts', []):
+            if chart['file'] < len(excel_files) and excel_files[chart['file']] is not None:
+                chart_data(excel_files[chart['file']], chart)
+        for pivot in page.get('pivots', []):
+            source = excel_files[pivot['file']] if pivot['file'] < len(excel_files) else None
+            if source is not None and source.get('kind') != 'csv':
+                pivot_table(source, pivot)
+
+def _run_warm_up(state):
+    with ThreadPoolExecutor(max_workers=WARMUP_WORKERS, thread_name_prefix="warm-up") as pool:
+        paths = list_persisted_boards()
+        for path, future in [(path, pool.submit(_read_snapshot_file, path)) for path in paths]:
+            try:
+                state['boards'][path] = future.result()
+            except Exception as e:
+                state['errors'].append(f"{os.path.basename(path)}: {e}")
+        state['parsed'].set()
+        boards = [board for team_boards, _ in state['boards'].values() for board in team_boards.values()]
+        state['total'] = len(boards)
+        for future in [pool.submit(warm_board, board) for board in boards]:
+            try:
+                future.result()
+            except Exception as e:
+                state['errors'].append(f"warm-up: {e}")
+            state['done'] += 1
+    state['seconds'] = time.perf_counter() - state['started']
+    state['ready'].set()
+
+def _read_snapshot_file(path):
+    with open(path, 'rb') as f:
+        return read_snapshot(f)
+
+@st.cache_resource
+def get_warm_up():
+    """Process-wide warm-up state; the first script run (a viewer or the readiness probe) starts it"""
+    state = {'parsed': threading.Event(), 'ready': threading.Event(), 'boards': {}, 'total': 0, 'done': 0,
+             'errors': [], 'started': time.perf_counter(), 'seconds': None}
+    threading.Thread(target=_run_warm_up, args=(state,), name="board-warm-up", daemon=True).start()
+    return state
+
+def is_readiness_probe():
+    """The script health check runs the script in a session the session manager doesn't know"""
+    ctx = get_script_run_ctx()
+    return ctx is not None and runtime.exists() and not runtime.get_instance().is_active_session(ctx.session_id)
+
+def load_persisted_boards(warm_up):
+    """Start a new session from the persisted boards (parsed once per process, copied per session)"""
+    warm_up['parsed'].wait()
+    boards, pages = {}, []
+    for team_boards, team_pages in warm_up['boards'].values():
+        boards.update({team: thaw_board(freeze_board(board)) for team, board in team_boards.items()})
+        pages += [p for p in team_pages if p not in pages]
+    if boards:
+        merge_boards(boards, pages)
+
+# Undo/redo history built on structurally shared board snapshots
+HISTORY_DEPTH = int(os.environ.get("DASHBOARD_HISTORY_DEPTH", 30))
+HISTORY_MAX_BYTES = int(os.environ.get("DASHBOARD_HISTORY_MAX_MB", 200)) * 1024 * 1024
+HISTORY_SCALARS = (str, int, float, bool, type(None), tuple)
+
+@st.cache_resource
+def _frozen_types():
+    # Defined once per process: the script re-runs on every interaction, and a class
+    # redefined on each run would fail isinstance checks against older snapshots
+    class FrozenList(tuple):
+        pass
+
+    class FrozenDict(dict):
+        pass
+
+    return FrozenList, FrozenDict
+
+_FrozenList, _FrozenDict = _frozen_types()
+
+def estimate_size(value):
+    """Approximate in-memory size of a single board value in bytes"""
+    if is_dataframe(value):
+        return int(value.memory_usage(deep=True).sum())
+    if isinstance(value, (bytes, str)):
+        return len(value)
+    if hasattr(value, 'getvalue'):
+        return getattr(value, 'size', None) or len(value.getvalue())
+    return sys.getsizeof(value)
+
+def freeze_board(value, prev=None, cost=None):
+    """Immutable copy of a board that reuses every unchanged node of prev.
+
+    Only containers on a changed path are new objects; cost[0] is increased
+    by the approximate bytes that were not shared with prev.
+    """
+    if isinstance(value, dict):
+        prev_items = prev if isinstance(prev, _FrozenDict) else {}
+        items = {k: freeze_board(v, prev_items.get(k), cost) for k, v in value.items()}
+        if prev is not None and len(items) == len(prev_items) and \
+                all(k in prev_items and prev_items[k] is v for k, v in items.items()):
+            return prev
+        if cost is not None:
+            cost[0] += sys.getsizeof(items)
+        return _FrozenDict(items)
+    if isinstance(value, list):
+        prev_items = prev if isinstance(prev, _FrozenList) else ()
+        items = [freeze_board(v, prev_items[i] if i < len(prev_items) else None, cost)
+                 for i, v in enumerate(value)]
+        if prev is not None and len(items) == len(prev_items) and \
+                all(a is b for a, b in zip(items, prev_items)):
+            return prev
+        if cost is not None:
+            cost[0] += sys.getsizeof(items)
+        return _FrozenList(items)
+    if isinstance(value, set):
+        if isinstance(prev, frozenset) and prev == value:
+            return prev
+        if cost is not None:
+            cost[0] += sys.getsizeof(value)
+        return frozenset(value)
+    # Leaves: uploads and DataFrames are replaced, never mutated, so identity is enough
+    if value is prev:
+        return prev
+    if isinstance(value, HISTORY_SCALARS) and type(prev) is type(value) and prev == value:
+        return prev
+    if cost is not None:
+        cost[0] += estimate_size(value)
+    return value
+
+def thaw_board(frozen):
+    """Mutable copy of a frozen board; leaves are shared, not copied"""
+    if isinstance(frozen, _FrozenDict):
+        return {k: thaw_board(v) for k, v in frozen.items()}
+    if isinstance(frozen, _FrozenList):
+        return [thaw_board(v) for v in frozen]
+    if isinstance(frozen, frozenset):
+        return set(frozen)
+    return frozen
+
+def get_board_history(team):
+    histories = st.session_state.setdefault('board_history', {})
+    if team not in histories:
+        histories[team] = {'present': None, 'present_cost': 0, 'undo': deque(), 'redo': []}
+    return histories[team]
+
+def _trim_history(history):
+    """Drop the oldest undo steps beyond the configured depth or memory budget"""
+    total = history['present_cost'] + sum(c for _, c in history['undo']) + sum(c for _, c in history['redo'])
+    while history['undo'] and (len(history['undo']) > HISTORY_DEPTH or total > HISTORY_MAX_BYTES):
+        total -= history['undo'].popleft()[1]
+    return total
+
+def record_board_history(team):
+    """Record the team's board as a new history step if anything changed since the last one"""
+    history = get_board_history(team)
+    cost = [0]
+    frozen = freeze_board(st.session_state.team_data[team], history['present'], cost)
+    if frozen is history['present']:
+        return False
+    if history['present'] is not None:
+        history['undo'].append((history['present'], history['present_cost']))
+        history['redo'].clear()
+    history['present'], history['present_cost'] = frozen, cost[0]
+    _trim_history(history)
+    return True
+
+def _widget_key_team(key, teams):
+    """Team whose name appears in a widget key as a whole '_'-separated segment (longest name wins)"""
+    return max((t for t in teams if f"_{t}_" in f"{key}_"), key=len, default=None)
+
+def _reset_board_widgets(team):
+    # Keyed widgets keep their own state and would write the old values back
+    teams = set(st.session_state.team_data) | {team}
+    for key in [k for k in st.session_state.keys() if isinstance(k, str) and k != 'selected_team'
+                and _widget_key_team(k, teams) == team]:
+        del st.session_state[key]
+
+def _restore_history_step(team, source, target):
+    history = get_board_history(team)
+    if not history[source]:
+        return
+    history[target].append((history['present'], history['present_cost']))
+    history['present'], history['present_cost'] = history[source].pop()
+    st.session_state.team_data[team] = thaw_board(history['present'])
+    _reset_board_widgets(team)
+    st.session_state.search_index = build_search_index(st.session_state.team_data,
+                                                       st.session_state.available_pages)
+    st.session_state.kpi_table = build_kpi_rollup(st.session_state.team_data)
+
+def undo_board(team):
+    _restore_history_step(team, 'undo', 'redo')
+
+def redo_board(team):
+    _restore_history_step(team, 'redo', 'undo')
+
+# Per-session memory accounting and idle-session eviction
+MEMORY_BUDGET_BYTES = int(os.environ.get("DASHBOARD_MEMORY_BUDGET_MB", 1024)) * 1024 * 1024
+SESSION_IDLE_SECONDS = int(os.environ.get("DASHBOARD_SESSION_IDLE_MINUTES", 60)) * 60
+SPILL_DIR = os.environ.get("DASHBOARD_SPILL_DIR")
+
+def get_spill_dir():
+    return SPILL_DIR or os.path.join(tempfile.gettempdir(), "dhl-dashboard-spill")
+
+@st.cache_resource
+def get_session_registry():
+    """Process-wide table of live sessions, shared by all sessions"""
+    return {'lock': threading.Lock(), 'sessions': {}}
+
+def format_bytes(n):
+    for unit in ["B", "KB", "MB", "GB"]:
+        if n < 1024 or unit == "GB":
+            return f"{n:.0f} {unit}" if unit == "B" else f"{n:.1f} {unit}"
+        n /= 1024
+
+def measure_state(*roots):
+    """Bytes held by session state objects by category; shared objects are counted once"""
+    usage = {'images': 0, 'tables': 0, 'other': 0}
+    seen = set()
+    stack = list(roots)
+    while stack:
+        value = stack.pop()
+        if id(value) in seen:
+            continue
+        seen.add(id(value))
+        if isinstance(value, dict):
+            usage['other'] += sys.getsizeof(value)
+            stack.extend(value.values())
+        elif isinstance(value, (list, tuple, set, frozenset, deque)):
+            usage['other'] += sys.getsizeof(value)
+            stack.extend(value)
+        elif is_dataframe(value):
+            usage['tables'] += estimate_size(value)
+        elif isinstance(value, bytes) or hasattr(value, 'getvalue'):
+            usage['images'] += estimate_size(value)
+        else:
+            usage['other'] += estimate_size(value)
+    usage['total'] = usage['images'] + usage['tables'] + usage['other']
+    return usage
+
+def _map_board_leaves(container, fn):
+    """Replace leaves in place wherever fn returns a value other than None"""
+    items = container.items() if isinstance(container, dict) else enumerate(container)
+    count = 0
+    for key, value in list(items):
+        if isinstance(value, (dict, list)) and not (isinstance(value, dict) and '$spilled' in value):
+            count += _map_board_leaves(value, fn)
+            continue
+        replacement = fn(value)
+        if replacement is not None:
+            container[key] = replacement
+            count += 1
+    return count
+
+def _spill_value(value):
+    if is_dataframe(value):
+        # Spill files never leave this process, so pickle: it round-trips any cell type exactly
+        data, kind = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL), 'frame'
+    elif isinstance(value, bytes) or hasattr(value, 'getvalue'):
+        data, kind = (value if isinstance(value, bytes) else value.getvalue()), 'file'
+    else:
+        return None
+    path = os.path.join(get_spill_dir(), hashlib.sha256(data).hexdigest())
+    if not os.path.exists(path):
+        with tempfile.NamedTemporaryFile(dir=get_spill_dir(), delete=False) as tmp:
+            tmp.write(data)
+        os.replace(tmp.name, path)
+    return {'$spilled': path, 'kind': kind}
+
+def _reload_value(value):
+    if not (isinstance(value, dict) and '$spilled' in value):
+        return None
+    with open(value['$spilled'], 'rb') as f:
+        data = f.read()
+    # Spilled files are named by the SHA-256 of their content
+    return pickle.loads(data) if value['kind'] == 'frame' else ContentBytes(data, os.path.basename(value['$spilled']))
+
+def spill_session(entry):
+    """Move an idle session's uploads and sheets to disk and drop its undo history"""
+    os.makedirs(get_spill_dir(), exist_ok=True)
+
+    def spill(value):
+        try:
+            replacement = _spill_value(value)
+        except (pickle.PicklingError, TypeError, OSError):
+            return None  # keep this one in memory
+        if replacement is not None:
+            # Counted as each leaf is replaced, so a partial spill is still reloaded
+            entry['spilled'] += 1
+        return replacement
+
+    _map_board_leaves(entry['team_data'], spill)
+    entry['history'].clear()
+    entry['usage'] = measure_state(entry['team_data'])
+
+def track_session_memory():
+    """Reload this session's spilled assets, update its accounting and enforce the budget"""
+    ctx = get_script_run_ctx()
+    session_id = ctx.session_id if ctx else "local"
+    registry = get_session_registry()
+    with registry['lock']:
+        entry = registry['sessions'].setdefault(session_id, {'lock': threading.Lock(), 'spilled': 0})
+    with entry['lock']:
+        if entry['spilled']:
+            _map_board_leaves(st.session_state.team_data, _reload_value)
+            entry['spilled'] = 0
+        entry['team_data'] = st.session_state.team_data
+        entry['history'] = st.session_state.setdefault('board_history', {})
+        entry['usage'] = measure_state(entry['team_data'], entry['history'])
+        entry['last_seen'] = time.time()
+
+    with registry['lock']:
+        # Forget sessions whose browser tab has gone away
+        if runtime.exists():
+            for sid in [s for s in registry['sessions'] if s != session_id and not runtime.get_instance().is_active_session(s)]:
+                del registry['sessions'][sid]
+        sessions = list(registry['sessions'].values())
+    total = sum(e.get('usage', {}).get('total', 0) for e in sessions)
+    if total > MEMORY_BUDGET_BYTES:
+        now = time.time()
+        idle = sorted((e for e in sessions if e is not entry and not e['spilled']
+                       and now - e.get('last_seen', now) > SESSION_IDLE_SECONDS),
+                      key=lambda e: e['last_seen'])
+        for idle_entry in idle:
+            if total <= MEMORY_BUDGET_BYTES:
+                break
+            with idle_entry['lock']:
+                before = idle_entry['usage']['total']
+                try:
+                    spill_session(idle_entry)
+                except Exception:
+                    # Another session's data must never break this viewer's page
+                    continue
+                total -= before - idle_entry['usage']['total']
+    return entry['usage'], total, len(sessions)
+
+# Hub-wide KPI rollup: one columnar table holding every team's KPIs
+def kpi_attainment(values, targets, higher_is_better):
+    """Vectorized attainment % (positive when the target is met) and achieved flags.
+
+    Same formula as get_kpi_performance; attainment is NaN where the target is 0.
+    """
+    values = np.asarray(values, dtype=float)
+    targets = np.asarray(targets, dtype=float)
+    higher = np.asarray(higher_is_better, dtype=bool)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        gap = np.where(higher, values - targets, targets - values)
+        attainment = np.where(targets == 0, np.nan, gap / targets * 100)
+    achieved = (targets != 0) & np.where(higher, values >= targets, values <= targets)
+    return attainment, achieved
+
+def new_kpi_table():
+    return {
+        'columns': {'team': [], 'name': [], 'value': [], 'target': [], 'higher': [], 'percent': [],
+                    'attainment': [], 'achieved': []},
+        'rows': {},         # (team, KPI position) -> row
+        'team_sizes': {},   # team -> number of KPIs
+        'free': [],         # rows of deleted KPIs, reused by the next insert
+        'groups': {},       # KPI name -> running aggregates
+        'version': next_content_version()
+    }
+
+def _kpi_fields(kpi):
+    return (kpi['name'], float(kpi['value']), float(kpi['target']),
+            bool(kpi.get('higher_is_better', True)), bool(kpi.get('is_percentage', False)))
+
+def _group_apply(table, row, sign):
+    """Add (sign=1) or remove (sign=-1) one row's contribution to its KPI name's aggregates"""
+    columns = table['columns']
+    group = table['groups'].setdefault(columns['name'][row],
+                                       {'teams': 0, 'achieved': 0, 'rated': 0, 'attainment_sum': 0.0})
+    group['teams'] += sign
+    group['achieved'] += sign * int(columns['achieved'][row])
+    if not math.isnan(columns['attainment'][row]):
+        group['rated'] += sign
+        group['attainment_sum'] += sign * columns['attainment'][row]
+    if group['teams'] == 0:
+        del table['groups'][columns['name'][row]]
+
+def _set_kpi_row(table, key, fields, attainment, achieved):
+    columns = table['columns']
+    row = table['rows'].get(key)
+    if row is not None:
+        _group_apply(table, row, -1)
+    elif table['free']:
+        row = table['rows'][key] = table['free'].pop()
+    else:
+        row = table['rows'][key] = len(columns['team'])
+        for values in columns.values():
+            values.append(None)
+    columns['team'][row] = key[0]
+    for column, value in zip(('name', 'value', 'target', 'higher', 'percent'), fields):
+        columns[column][row] = value
+    columns['attainment'][row] = float(attainment)
+    columns['achieved'][row] = bool(achieved)
+    _group_apply(table, row, 1)
+
+def _drop_kpi_row(table, key):
+    row = table['rows'].pop(key)
+    _group_apply(table, row, -1)
+    table['columns']['team'][row] = None
+    table['free'].append(row)
+
+def sync_team_kpis(table, team, kpis):
+    """Bring one team's rows up to date, touching only KPIs that changed"""
+    columns = table['columns']
+    changed = False
+    for i, kpi in enumerate(kpis):
+        fields = _kpi_fields(kpi)
+        row = table['rows'].get((team, i))
+        if row is not None and tuple(columns[c][row] for c in ('name', 'value', 'target', 'higher', 'percent')) == fields:
+            continue
+        attainment, achieved = kpi_attainment([fields[1]], [fields[2]], [fields[3]])
+        _set_kpi_row(table, (team, i), fields, attainment[0], achieved[0])
+        changed = True
+    for i in range(len(kpis), table['team_sizes'].get(team, 0)):
+        _drop_kpi_row(table, (team, i))
+        changed = True
+    table['team_sizes'][team] = len(kpis)
+    if changed:
+        table['version'] = next_content_version()
+    return changed
+
+def build_kpi_rollup(team_data):
+    """Build the table for all teams, evaluating every KPI in one vectorized pass"""
+    table = new_kpi_table()
+    keys, fields = [], []
+    for team, data in team_data.items():
+        for i, kpi in enumerate(data.get('kpis', [])):
+            keys.append((team, i))
+            fields.append(_kpi_fields(kpi))
+        table['team_sizes'][team] = len(data.get('kpis', []))
+    if fields:
+        _, values, targets, higher, _ = zip(*fields)
+        attainment, achieved = kpi_attainment(values, targets, higher)
+        for key, row_fields, row_attainment, row_achieved in zip(keys, fields, attainment, achieved):
+            _set_kpi_row(table, key, row_fields, row_attainment, row_achieved)
+    return table
+
+def kpi_rollup_summary(table):
+    """One row per KPI name from the running aggregates, best average attainment first"""
+    summary = pd.DataFrame([
+        {'KPI': name, 'Teams': g['teams'], 'Achieved': g['achieved'],
+         'Achieved %': 100 * g['achieved'] / g['teams'],
+         'Avg Attainment %': g['attainment_sum'] / g['rated'] if g['rated'] else np.nan}
+        for name, g in table['groups'].items()
+    ], columns=['KPI', 'Teams', 'Achieved', 'Achieved %', 'Avg Attainment %'])
+    return summary.sort_values('Avg Attainment %', ascending=False, na_position='last').round(1)
+
+def kpi_rollup_ranking(table, kpi_name=None):
+    """Every team's KPIs ranked by attainment, optionally for a single KPI name"""
+    columns = table['columns']
+    team = np.array(columns['team'], dtype=object)
+    name = np.array(columns['name'], dtype=object)
+    mask = team != None  # noqa: E711 (elementwise comparison)
+    if kpi_name is not None:
+        mask &= name == kpi_name
+    rows = np.flatnonzero(mask)
+    attainment = np.array(columns['attainment'], dtype=float)[rows]
+    rows = rows[np.argsort(np.where(np.isnan(attainment), np.inf, -attainment), kind='stable')]
+    pick = lambda column: [columns[column][r] for r in rows]
+    return pd.DataFrame({
+        'Rank': np.arange(1, len(rows) + 1),
+        'Team': pick('team'),
+        'KPI': pick('name'),
+        'Value': pick('value'),
+        'Target': pick('target'),
+        'Attainment %': np.round(np.array(pick('attainment'), dtype=float), 1),
+        'Status': ["✅ Achieved" if a else "❌ Missed" for a in pick('achieved')]
+    })
+
+# Startup profiling
+PROFILED_MODULES = ["streamlit", "pandas", "openpyxl", "pyarrow", "zipfile", "tempfile"]
+
+def profile_cold_imports(modules=PROFILED_MODULES):
+    """Import each module in a fresh interpreter with -X importtime and report its cost"""
+    results = []
+    for name in modules:
+        proc = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {name}"],
+                              capture_output=True, text=True, timeout=120)
+        row = {'Module': name, 'Import (ms)': None, 'Self (ms)': None, 'Modules loaded': 0}
+        if proc.returncode == 0:
+            # Lines look like "import time:       123 |       4567 |   pandas"
+            for line in proc.stderr.splitlines():
+                parts = line.removeprefix("import time:").split("|")
+                if len(parts) != 3 or not parts[0].strip().isdigit():
+                    continue
+                row['Modules loaded'] += 1
+                if parts[2].strip() == name:
+                    row['Self (ms)'] = int(parts[0]) / 1000
+                    row['Import (ms)'] = int(parts[1]) / 1000
+        results.append(row)
+    return results
+
 # Function to determine KPI performance and format value
 def get_kpi_performance(value, target, higher_is_better=True, is_percentage=False):
     if target == 0:
@@ -309,20 +1808,30 @@ def get_kpi_performance(value, target, higher_is_better=True, is_percentage=Fals
     
     return performance_text, achieved, formatted_value, formatted_target, result_color
 
+# Readiness: the load balancer probes /_stcore/script-health-check, which runs this script
+# in a session of its own and answers 503 until the warm-up has filled the caches
+warm_up = get_warm_up()
+if is_readiness_probe():
+    if not warm_up['ready'].is_set():
+        raise RuntimeError(f"Warming up caches: {warm_up['done']}/{warm_up['total']} boards")
+    st.stop()
+
 init_session_state()
+if 'persisted_boards_loaded' not in st.session_state:
+    st.session_state.persisted_boards_loaded = True
+    load_persisted_boards(warm_up)
+session_usage, all_sessions_usage, session_count = track_session_memory()
+SETUP_FINISHED = time.perf_counter()
 
 # Sidebar with TEAM SELECTION AT TOP
 with st.sidebar:
     # TEAM SELECTION FIRST (moved to top as requested)
     st.markdown("### 👥 Team Selection")
-    team_options = ["Team PUD", "Team WTH"]
-    selected_team = st.selectbox("Select Team:", team_options)
+    team_options = list(st.session_state.team_data)
+    selected_team = st.selectbox("Select Team:", team_options, key="selected_team")
     
     # Convert back to full names for header display
-    if selected_team == "Team PUD":
-        header_title = "PUD Performance Dialogue"
-    else:
-        header_title = "WTH Performance Dialogue"
+    header_title = f"{selected_team.removeprefix('Team ')} Performance Dialogue"
     
     # Get current team data
     current_team_data = st.session_state.team_data[selected_team]
@@ -330,9 +1839,34 @@ with st.sidebar:
     # Add additional_pages field if it doesn't exist (backward compatibility)
     if 'additional_pages' not in current_team_data:
         current_team_data['additional_pages'] = {}
-    
+
+    search_index = st.session_state.search_index
+
+    # Undo / redo for the selected team's board (filled in at the end of the run,
+    # once this run's edits have been recorded)
+    record_board_history(selected_team)
+    history_controls = st.container()
+
     st.markdown("---")
-    
+
+    # SEARCH ACROSS ALL TEAMS AND PAGES
+    st.markdown("### 🔍 Search")
+    search_query = st.text_input("Search all boards", key="search_query", placeholder="e.g. forklift safety",
+                                 label_visibility="collapsed")
+    if search_query:
+        search_results = search_boards(search_index, search_query)
+        if search_results:
+            for n, (doc, score) in enumerate(search_results):
+                st.markdown(f"**{SEARCH_KIND_LABELS[doc['kind']]}** · {doc['team']} · {doc['page']}")
+                snippet = doc['text'] if len(doc['text']) <= 120 else doc['text'][:117] + "..."
+                st.caption(snippet)
+                st.button("Open", key=f"open_search_result_{n}", on_click=open_search_result,
+                          args=(doc['team'], doc['page']))
+        else:
+            st.caption("No matches.")
+
+    st.markdown("---")
+
     # EXPORT FUNCTIONALITY - SCREENSHOT BASED
     st.markdown("### 📸 Export Dashboard")
     
@@ -379,9 +1913,84 @@ with st.sidebar:
         st.rerun()
     
     st.markdown("---")
+
+    # BACKUP, RESTORE AND CLONE
+    st.markdown("### 💾 Backup & Restore")
+
+    backup_scope = st.radio("Backup", ["Current team", "All teams"], horizontal=True, key="backup_scope")
+    if st.button("💾 Create Backup", use_container_width=True):
+        backup_teams = [selected_team] if backup_scope == "Current team" else None
+        try:
+            backup_data = export_snapshot_bytes(st.session_state.team_data, st.session_state.available_pages, backup_teams)
+        except (ValueError, TypeError, OSError) as e:
+            st.error(f"Could not create backup: {str(e)}")
+        else:
+            st.download_button(
+                label="⬇️ Download Backup (ZIP)",
+                data=backup_data,
+                file_name=f"{selected_team if backup_teams else 'Hub'}_Backup_{datetime.now().strftime('%Y%m%d_%H%M')}.zip",
+                mime="application/zip",
+                use_container_width=True
+            )
+
+    if 'snapshot_notice' in st.session_state:
+        st.success(st.session_state.pop('snapshot_notice'))
+    snapshot_file = st.file_uploader("Restore from backup", type=['zip'], key="snapshot_upload")
+    if snapshot_file is not None and st.button("♻️ Restore Backup", use_container_width=True):
+        try:
+            restored = restore_snapshot(snapshot_file)
+        except (ValueError, KeyError, zipfile.BadZipFile) as e:
+            st.error(f"Could not restore backup: {str(e)}")
+        else:
+            # Rerun so no widget rendered below writes pre-restore values back
+            st.session_state.snapshot_notice = f"Restored: {', '.join(restored)}"
+            st.rerun()
+
+    new_team_name = st.text_input("Clone current board as", placeholder="Team NEW", key="clone_team_name")
+    if st.button("📑 Clone Board", use_container_width=True):
+        if not new_team_name.strip() or new_team_name.strip() in st.session_state.team_data:
+            st.error("Enter a new, unused team name.")
+        else:
+            try:
+                clone_team_board(selected_team, new_team_name.strip())
+            except (ValueError, TypeError, OSError) as e:
+                st.error(f"Could not clone board: {str(e)}")
+            else:
+                st.session_state.snapshot_notice = f"Cloned {selected_team} to {new_team_name.strip()}"
+                st.rerun()
+
+    # Memory used by this and all other sessions in this process
+    with st.expander("🧠 Memory Usage", expanded=False):
+        st.markdown(f"**This session:** {format_bytes(session_usage['total'])}")
+        st.caption(f"Images {format_bytes(session_usage['images'])} · Tables {format_bytes(session_usage['tables'])} · "
+                   f"Other {format_bytes(session_usage['other'])}")
+        st.markdown(f"**All sessions ({session_count}):** {format_bytes(all_sessions_usage)} "
+                    f"of {format_bytes(MEMORY_BUDGET_BYTES)}")
+        st.progress(min(all_sessions_usage / MEMORY_BUDGET_BYTES, 1.0))
+
+    # Startup and import timings
+    with st.expander("⏱️ Startup Profile", expanded=False):
+        st.markdown(f"**Script setup:** {(SETUP_FINISHED - STARTUP_STARTED) * 1000:.0f} ms")
+        lazy_import_times = get_lazy_import_times()
+        if lazy_import_times:
+            for name, seconds in sorted(lazy_import_times.items(), key=lambda kv: -kv[1]):
+                st.caption(f"{name}: loaded on demand in {seconds * 1000:.0f} ms")
+        else:
+            st.caption("No heavy modules loaded yet.")
+        if warm_up['ready'].is_set():
+            st.caption(f"Warm-up: {warm_up['total']} persisted boards cached in {warm_up['seconds']:.1f} s")
+        else:
+            st.caption(f"Warm-up: {warm_up['done']}/{warm_up['total']} persisted boards cached so far")
+        for error in warm_up['errors']:
+            st.caption(f"⚠️ {error}")
+        if st.button("Measure cold import times", use_container_width=True):
+            st.dataframe(pd.DataFrame(profile_cold_imports()), use_container_width=True, hide_index=True)
+
+    st.markdown("---")
     
     # PAGE NAVIGATION
     st.markdown("### 📋 Navigation")
+    st.toggle("🌐 Hub KPI Rollup", key="show_kpi_rollup", help="Every team's KPIs in one ranked view")
     st.session_state.current_page = st.selectbox("Select Page:", st.session_state.available_pages, 
                                                  index=st.session_state.available_pages.index(st.session_state.current_page))
     
@@ -413,7 +2022,8 @@ with st.sidebar:
         st.markdown("### 📈 Performance Management")
         
         # KPI Font Size Control
-        current_team_data['kpi_font_size'] = st.slider("KPI Font Size", 16, 40, current_team_data['kpi_font_size'])
+        current_team_data['kpi_font_size'] = st.slider("KPI Font Size", 16, 40, current_team_data['kpi_font_size'],
+                                                       key=f"kpi_font_size_{selected_team}")
         
         if st.button("➕ Add New KPI"):
             if len(current_team_data['kpis']) < 6:
@@ -427,7 +2037,8 @@ with st.sidebar:
                 })
                 st.rerun()
         
-        uploaded_image = st.file_uploader("Upload Performance Visual", type=['png', 'jpg', 'jpeg'], key="perf_image")
+        uploaded_image = st.file_uploader("Upload Performance Visual", type=['png', 'jpg', 'jpeg'],
+                                          key=f"perf_image_{selected_team}")
         if uploaded_image is not None:
             current_team_data['performance_image'] = uploaded_image
             st.success("Image uploaded!")
@@ -485,6 +2096,7 @@ with st.sidebar:
                         st.rerun()
         
         st.caption(f"KPIs: {len(current_team_data['kpis'])}/6")
+        sync_team_kpis(st.session_state.kpi_table, selected_team, current_team_data['kpis'])
         
         # Safety & News Management
         st.markdown("---")
@@ -507,8 +2119,11 @@ with st.sidebar:
                 with st.expander(f"{item['type']} {i+1}", expanded=False):
                     item['content'] = st.text_area("Content", value=item['content'], key=f"edit_safety_news_{selected_team}_{i}")
                     item['font_size'] = st.slider("Font Size", 12, 24, item['font_size'], key=f"edit_font_size_sn_{selected_team}_{i}")
+                    index_document(search_index, search_key(selected_team, "Dashboard", 'safety_news', id(item)),
+                                   item['content'], selected_team, "Dashboard", item['type'].lower())
                     
                     if st.button(f"🗑️ Delete {item['type']}", key=f"delete_safety_news_{selected_team}_{i}"):
+                        unindex_document(search_index, search_key(selected_team, "Dashboard", 'safety_news', id(item)))
                         current_team_data['safety_news'].pop(i)
                         st.rerun()
         
@@ -526,8 +2141,11 @@ with st.sidebar:
                 with st.expander(f"Team News {i+1}", expanded=False):
                     news['content'] = st.text_area("Content", value=news['content'], key=f"edit_team_news_{selected_team}_{i}")
                     news['font_size'] = st.slider("Font Size", 12, 24, news['font_size'], key=f"edit_font_size_tn_{selected_team}_{i}")
+                    index_document(search_index, search_key(selected_team, "Dashboard", 'team_news', id(news)),
+                                   news['content'], selected_team, "Dashboard", 'team_news')
                     
                     if st.button(f"🗑️ Delete News", key=f"delete_team_news_{selected_team}_{i}"):
+                        unindex_document(search_index, search_key(selected_team, "Dashboard", 'team_news', id(news)))
                         current_team_data['team_news'].pop(i)
                         st.rerun()
         
@@ -535,30 +2153,40 @@ with st.sidebar:
         st.markdown("---")
         st.markdown("### 💡 Ideas & Actions Management")
         
+        actions_store = ensure_actions_store(current_team_data)
+
         if st.button("➕ Add New Action"):
-            current_team_data['ideas_actions'].append({
+            add_action(actions_store, {
                 'idea': 'New idea',
                 'todo': 'Action needed',
                 'who': 'Person',
-                'when': 'Date',
+                'when': datetime.now().strftime('%Y-%m-%d'),
                 'status': 'In Progress'
             })
             st.rerun()
-        
-        # Edit existing actions
-        if current_team_data['ideas_actions']:
-            for i, action in enumerate(current_team_data['ideas_actions']):
+
+        # Edit existing actions (widget keys use the stable action id)
+        if actions_store['order']:
+            for i, aid in enumerate(list(actions_store['order'])):
+                action = get_action(actions_store, aid)
                 with st.expander(f"Action {i+1}", expanded=False):
-                    action['idea'] = st.text_input("Idea", value=action['idea'], key=f"edit_idea_{selected_team}_{i}")
-                    action['todo'] = st.text_input("To Do", value=action['todo'], key=f"edit_todo_{selected_team}_{i}")
-                    action['who'] = st.text_input("Who", value=action['who'], key=f"edit_who_{selected_team}_{i}")
-                    action['when'] = st.text_input("Till When", value=action['when'], key=f"edit_when_{selected_team}_{i}")
-                    action['status'] = st.selectbox("Status", ["In Progress", "Completed"], 
-                                                  index=0 if action['status'] == 'In Progress' else 1,
-                                                  key=f"edit_status_{selected_team}_{i}")
-                    
-                    if st.button(f"🗑️ Delete Action", key=f"delete_action_{selected_team}_{i}"):
-                        current_team_data['ideas_actions'].pop(i)
+                    idea = st.text_input("Idea", value=action['idea'], key=f"edit_idea_{selected_team}_{aid}")
+                    todo = st.text_input("To Do", value=action['todo'], key=f"edit_todo_{selected_team}_{aid}")
+                    who = st.text_input("Who", value=action['who'], key=f"edit_who_{selected_team}_{aid}")
+                    when = st.text_input("Till When", value=action['when'], key=f"edit_when_{selected_team}_{aid}",
+                                         help="Use a date such as 2024-05-31 or 31.05.2024 so the action can be sorted and flagged when overdue")
+                    status = st.selectbox("Status", ACTION_STATUSES,
+                                          index=ACTION_STATUSES.index(action['status']),
+                                          key=f"edit_status_{selected_team}_{aid}")
+                    update_action(actions_store, aid, idea=idea, todo=todo, who=who, when=when, status=status)
+                    index_document(search_index, search_key(selected_team, "Dashboard", 'action', aid),
+                                   action_search_text(actions_store, aid), selected_team, "Dashboard", 'action')
+                    if when.strip() and actions_store['columns']['due'][aid] is None:
+                        st.caption("⚠️ Not recognised as a date")
+
+                    if st.button(f"🗑️ Delete Action", key=f"delete_action_{selected_team}_{aid}"):
+                        unindex_document(search_index, search_key(selected_team, "Dashboard", 'action', aid))
+                        delete_action(actions_store, aid)
                         st.rerun()
     
     else:  # Additional Content or Additional Pages
@@ -570,23 +2198,35 @@ with st.sidebar:
                 current_team_data['picture_info'] = []
             if 'excel_files' not in current_team_data:
                 current_team_data['excel_files'] = []
+            if 'charts' not in current_team_data:
+                current_team_data['charts'] = []
+            if 'pivots' not in current_team_data:
+                current_team_data['pivots'] = []
             page_data = {
                 'pictures': current_team_data['pictures'],
                 'picture_info': current_team_data['picture_info'],
-                'excel_files': current_team_data['excel_files']
+                'excel_files': current_team_data['excel_files'],
+                'charts': current_team_data['charts'],
+                'pivots': current_team_data['pivots']
             }
         else:
             if st.session_state.current_page not in current_team_data['additional_pages']:
                 current_team_data['additional_pages'][st.session_state.current_page] = {
                     'pictures': [],
                     'picture_info': [],
-                    'excel_files': []
+                    'excel_files': [],
+                    'charts': [],
+                    'pivots': []
                 }
             page_data = current_team_data['additional_pages'][st.session_state.current_page]
             
-            # Add excel_files field if it doesn't exist (backward compatibility)
+            # Add excel_files, charts and pivots fields if they don't exist (backward compatibility)
             if 'excel_files' not in page_data:
                 page_data['excel_files'] = []
+            if 'charts' not in page_data:
+                page_data['charts'] = []
+            if 'pivots' not in page_data:
+                page_data['pivots'] = []
         
         # Pictures Management
         st.markdown("### 📸 Pictures Management")
@@ -622,13 +2262,18 @@ with st.sidebar:
         
         # Excel upload slots
         for i in range(len(page_data['excel_files'])):
-            uploaded_excel = st.file_uploader(f"Excel File {i+1}", type=['xlsx', 'xls'], 
+            uploaded_excel = st.file_uploader(f"Excel File {i+1}", type=['xlsx', 'xls'] + CSV_TYPES,
+                                          help=f"Up to {st.get_option('server.maxUploadSize'):,} MB. Large CSV/TSV extracts are streamed: "
+                                               "you get column statistics and a sampled preview",
                                           key=f"excel_{selected_team}_{st.session_state.current_page}_{i}")
             if uploaded_excel is not None:
-                excel_info = process_excel_file(uploaded_excel)
+                excel_info, is_new = ingest_excel_upload(uploaded_excel, page_data['excel_files'][i])
                 if excel_info:
                     page_data['excel_files'][i] = excel_info
-                    st.success(f"Excel file {i+1} processed! Shape: {excel_info['shape']}")
+                    if excel_info.get('diff'):
+                        st.success(f"Excel file {i+1} updated! {describe_diff(excel_info['diff'])}")
+                    else:
+                        st.success(f"Excel file {i+1} processed! Shape: {excel_info['shape']}")
             
             if page_data['excel_files'][i] is not None:
                 if st.button(f"🗑️ Remove Excel {i+1}", key=f"remove_excel_{selected_team}_{st.session_state.current_page}_{i}"):
@@ -636,7 +2281,89 @@ with st.sidebar:
                     st.rerun()
         
         st.caption(f"Excel Files: {len([e for e in page_data['excel_files'] if e is not None])}/2")
-        
+
+        # Charts over the uploaded sheets (downsampled for display)
+        st.markdown("---")
+        st.markdown("### 📈 Charts")
+
+        chart_sources = [i for i, e in enumerate(page_data['excel_files']) if e is not None]
+        if st.button("➕ Add Chart", disabled=not chart_sources):
+            if len(page_data['charts']) < 4:
+                page_data['charts'].append({'id': next_item_id(page_data['charts']), 'file': chart_sources[0],
+                                            'x': None, 'y': [], 'kind': CHART_KINDS[0]})
+                st.rerun()
+
+        for chart in page_data['charts']:
+            if 'id' not in chart:
+                chart['id'] = next_item_id(page_data['charts'])
+        for i, chart in enumerate(page_data['charts']):
+            with st.expander(f"Chart {i+1}", expanded=not chart['y']):
+                if not chart_sources:
+                    st.caption("Upload an Excel file to chart it.")
+                    continue
+                chart_key = f"{selected_team}_{st.session_state.current_page}_{chart['id']}"
+                chart['file'] = st.selectbox("Sheet", chart_sources,
+                                             index=chart_sources.index(chart['file']) if chart['file'] in chart_sources else 0,
+                                             format_func=lambda j: page_data['excel_files'][j]['filename'],
+                                             key=f"chart_file_{chart_key}")
+                source = page_data['excel_files'][chart['file']]
+                x_options = [None] + [str(c) for c in source['columns']]
+                chart['x'] = st.selectbox("X axis", x_options,
+                                          index=x_options.index(chart['x']) if chart['x'] in x_options else 0,
+                                          format_func=lambda c: CHART_ROW_AXIS if c is None else c,
+                                          key=f"chart_x_{chart_key}")
+                y_options = [c for c in numeric_columns(source) if c != chart['x']]
+                chart['y'] = st.multiselect("Values", y_options, default=[c for c in chart['y'] if c in y_options],
+                                            key=f"chart_y_{chart_key}")
+                chart['kind'] = st.radio("Type", CHART_KINDS, index=CHART_KINDS.index(chart['kind']),
+                                         horizontal=True, key=f"chart_kind_{chart_key}")
+                if st.button("🗑️ Delete Chart", key=f"delete_chart_{chart_key}"):
+                    page_data['charts'].pop(i)
+                    st.rerun()
+
+        st.caption(f"Charts: {len(page_data['charts'])}/4")
+
+        # Pivots (group-by summaries) over the uploaded sheets
+        st.markdown("---")
+        st.markdown("### 🧮 Pivots")
+
+        sheet_sources = pivot_sources(page_data)
+        if st.button("➕ Add Pivot", disabled=not sheet_sources):
+            if len(page_data['pivots']) < 4:
+                page_data['pivots'].append({'id': next_item_id(page_data['pivots']), 'file': sheet_sources[0],
+                                            'by': [], 'values': [], 'agg': "Sum"})
+                st.rerun()
+
+        for pivot in page_data['pivots']:
+            if 'id' not in pivot:
+                pivot['id'] = next_item_id(page_data['pivots'])
+        for i, pivot in enumerate(page_data['pivots']):
+            with st.expander(f"Pivot {i+1}", expanded=not pivot['by']):
+                if not sheet_sources:
+                    st.caption("Upload an Excel file to summarize it.")
+                    continue
+                pivot_key = f"{selected_team}_{st.session_state.current_page}_{pivot['id']}"
+                pivot['file'] = st.selectbox("Sheet", sheet_sources,
+                                             index=sheet_sources.index(pivot['file']) if pivot['file'] in sheet_sources else 0,
+                                             format_func=lambda j: page_data['excel_files'][j]['filename'],
+                                             key=f"pivot_file_{pivot_key}")
+                source = page_data['excel_files'][pivot['file']]
+                all_columns = [str(c) for c in source['columns']]
+                pivot['by'] = st.multiselect("Group by", all_columns, default=[c for c in pivot['by'] if c in all_columns],
+                                             key=f"pivot_by_{pivot_key}")
+                value_options = [c for c in numeric_columns(source) if c not in pivot['by']]
+                pivot['values'] = st.multiselect("Values", value_options,
+                                                 default=[c for c in pivot['values'] if c in value_options],
+                                                 key=f"pivot_values_{pivot_key}")
+                pivot['agg'] = st.selectbox("Aggregation", list(PIVOT_AGGREGATIONS),
+                                            index=list(PIVOT_AGGREGATIONS).index(pivot['agg']),
+                                            key=f"pivot_agg_{pivot_key}")
+                if st.button("🗑️ Delete Pivot", key=f"delete_pivot_{pivot_key}"):
+                    page_data['pivots'].pop(i)
+                    st.rerun()
+
+        st.caption(f"Pivots: {len(page_data['pivots'])}/4")
+
         # Picture Info Management
         st.markdown("---")
         st.markdown("### 📝 Picture Information")
@@ -653,8 +2380,11 @@ with st.sidebar:
                                                   key=f"edit_pic_info_{selected_team}_{st.session_state.current_page}_{i}")
                     info['font_size'] = st.slider("Font Size", 12, 24, info['font_size'], 
                                                  key=f"edit_pic_info_font_{selected_team}_{st.session_state.current_page}_{i}")
+                    index_document(search_index, search_key(selected_team, st.session_state.current_page, 'picture_info', id(info)),
+                                   info['content'], selected_team, st.session_state.current_page, 'picture_info')
                     
                     if st.button(f"🗑️ Delete Info", key=f"delete_pic_info_{selected_team}_{st.session_state.current_page}_{i}"):
+                        unindex_document(search_index, search_key(selected_team, st.session_state.current_page, 'picture_info', id(info)))
                         page_data['picture_info'].pop(i)
                         st.rerun()
 
@@ -664,7 +2394,10 @@ if st.session_state.screenshot_mode:
 
 # Header with DHL brand text and page number
 current_date = datetime.now().strftime("%B %d, %Y")
-if st.session_state.current_page == "Dashboard":
+if st.session_state.get('show_kpi_rollup'):
+    header_title = "Hub KPI Rollup"
+    header_right = current_date
+elif st.session_state.current_page == "Dashboard":
     header_right = current_date
 else:
     page_number = st.session_state.available_pages.index(st.session_state.current_page)
@@ -682,7 +2415,27 @@ st.markdown(f"""
 """, unsafe_allow_html=True)
 
 # Display content based on current page
-if st.session_state.current_page == "Dashboard":
+if st.session_state.get('show_kpi_rollup'):
+    # HUB KPI ROLLUP (all teams)
+    kpi_table = st.session_state.kpi_table
+
+    if kpi_table['groups']:
+        with st.container(border=True):
+            st.markdown("### 🏆 Attainment by KPI")
+            st.dataframe(display_table((kpi_table['version'], 'summary'), lambda: kpi_rollup_summary(kpi_table)),
+                         use_container_width=True, hide_index=True)
+
+        with st.container(border=True):
+            st.markdown("### 📊 Team Ranking")
+            kpi_filter = st.selectbox("KPI", ["All KPIs"] + sorted(kpi_table['groups']), key="rollup_kpi_filter")
+            kpi_name = None if kpi_filter == "All KPIs" else kpi_filter
+            st.dataframe(display_table((kpi_table['version'], 'ranking', kpi_name),
+                                       lambda: kpi_rollup_ranking(kpi_table, kpi_name)),
+                         use_container_width=True, hide_index=True)
+    else:
+        st.info("No KPIs added by any team yet.")
+
+elif st.session_state.current_page == "Dashboard":
     # DASHBOARD PAGE CONTENT (your existing dashboard code)
     
     # Top row using pure Streamlit containers
@@ -695,7 +2448,7 @@ if st.session_state.current_page == "Dashboard":
             
             # Display performance image if exists
             if current_team_data['performance_image'] is not None:
-                st.image(current_team_data['performance_image'], width=460)
+                show_image(current_team_data['performance_image'], width=460)
             
             # Display KPIs with color coding and dynamic font size
             if current_team_data['performance_image'] is not None:
@@ -832,26 +2585,34 @@ if st.session_state.current_page == "Dashboard":
         with st.container(border=True):
             st.markdown("### 💡 Ideas & Actions")
             
-            if current_team_data['ideas_actions']:
-                # Create a DataFrame for table display
-                df_data = []
-                for action in current_team_data['ideas_actions']:
-                    status_display = action['status']
-                    if action['status'] == 'Completed':
-                        status_display = f"✅ {action['status']}"
-                    elif action['status'] == 'In Progress':
-                        status_display = f"🟡 {action['status']}"
-                    
-                    df_data.append({
-                        'Idea': action['idea'],
-                        'To Do': action['todo'],
-                        'Who': action['who'],
-                        'Till When': action['when'],
-                        'Status': status_display
-                    })
-                
-                df = pd.DataFrame(df_data)
-                st.dataframe(df, use_container_width=True, hide_index=True)
+            actions_store = ensure_actions_store(current_team_data)
+
+            if actions_store['order']:
+                # Filtered views are answered from the store's indexes
+                view = st.selectbox("View", ACTION_VIEWS, key=f"actions_view_{selected_team}",
+                                    label_visibility="collapsed")
+                if view == "Overdue":
+                    action_ids = query_overdue(actions_store)
+                elif view == "Due This Week":
+                    action_ids = query_due_this_week(actions_store)
+                elif view == "By Owner":
+                    owner = st.selectbox("Owner", sorted(actions_store['by_owner']), key=f"actions_owner_{selected_team}")
+                    action_ids = query_by_owner(actions_store, owner)
+                elif view == "By Status":
+                    status = st.selectbox("Status", ACTION_STATUSES, key=f"actions_status_{selected_team}")
+                    action_ids = query_by_status(actions_store, status)
+                else:
+                    action_ids = actions_store['order']
+
+                if action_ids:
+                    actions_table = display_table(
+                        (actions_store['version'], view, tuple(action_ids)),
+                        lambda: actions_to_frame(actions_store, action_ids),
+                        columns=['Idea', 'To Do', 'Who', 'Till When', 'Status']
+                    )
+                    st.dataframe(actions_table, use_container_width=True, hide_index=True)
+                else:
+                    st.info(f"No actions in view: {view}.")
             else:
                 st.info("No ideas or actions added yet.")
 
@@ -877,23 +2638,35 @@ else:
             current_team_data['picture_info'] = []
         if 'excel_files' not in current_team_data:
             current_team_data['excel_files'] = []
+        if 'charts' not in current_team_data:
+            current_team_data['charts'] = []
+        if 'pivots' not in current_team_data:
+            current_team_data['pivots'] = []
         page_data = {
             'pictures': current_team_data['pictures'],
             'picture_info': current_team_data['picture_info'],
-            'excel_files': current_team_data['excel_files']
+            'excel_files': current_team_data['excel_files'],
+            'charts': current_team_data['charts'],
+            'pivots': current_team_data['pivots']
         }
     else:
         if st.session_state.current_page not in current_team_data['additional_pages']:
             current_team_data['additional_pages'][st.session_state.current_page] = {
                 'pictures': [],
                 'picture_info': [],
-                'excel_files': []
+                'excel_files': [],
+                'charts': [],
+                'pivots': []
             }
         page_data = current_team_data['additional_pages'][st.session_state.current_page]
         
-        # Add excel_files field if it doesn't exist (backward compatibility)
+        # Add excel_files, charts and pivots fields if they don't exist (backward compatibility)
         if 'excel_files' not in page_data:
             page_data['excel_files'] = []
+        if 'charts' not in page_data:
+            page_data['charts'] = []
+        if 'pivots' not in page_data:
+            page_data['pivots'] = []
     
     # Count actual pictures and excel files
     actual_pictures = [p for p in page_data['pictures'] if p is not None]
@@ -908,34 +2681,34 @@ else:
         # Display Pictures
         if num_pictures == 1 and num_excel_files == 0:
             # Single picture - stretch to full width
-            st.image(actual_pictures[0], width=600, caption="Picture 1")
+            show_image(actual_pictures[0], width=600, caption="Picture 1")
         elif num_pictures > 1 or num_excel_files > 0:
             # Multiple items - arrange in grid
             
             # Display pictures first
             if num_pictures > 0:
                 if num_pictures == 1:
-                    st.image(actual_pictures[0], width=600, caption="Picture 1")
+                    show_image(actual_pictures[0], width=600, caption="Picture 1")
                 else:
                     # Multiple pictures in 2x2 grid
                     pic_cols_top = st.columns(2)
                     with pic_cols_top[0]:
                         if num_pictures >= 1:
-                            st.image(actual_pictures[0], width=300, caption="Picture 1")
+                            show_image(actual_pictures[0], width=300, caption="Picture 1")
                     
                     with pic_cols_top[1]:
                         if num_pictures >= 2:
-                            st.image(actual_pictures[1], width=300, caption="Picture 2")
+                            show_image(actual_pictures[1], width=300, caption="Picture 2")
                     
                     if num_pictures > 2:
                         pic_cols_bottom = st.columns(2)
                         with pic_cols_bottom[0]:
                             if num_pictures >= 3:
-                                st.image(actual_pictures[2], width=300, caption="Picture 3")
+                                show_image(actual_pictures[2], width=300, caption="Picture 3")
                         
                         with pic_cols_bottom[1]:
                             if num_pictures >= 4:
-                                st.image(actual_pictures[3], width=300, caption="Picture 4")
+                                show_image(actual_pictures[3], width=300, caption="Picture 4")
             
             # Display Excel files
             if num_excel_files > 0:
@@ -944,12 +2717,59 @@ else:
                     st.markdown(f"""
                     <div class="excel-container">
                         <h4>📊 {excel_info['filename']}</h4>
-                        <p><strong>Rows:</strong> {excel_info['shape'][0]} | <strong>Columns:</strong> {excel_info['shape'][1]}</p>
+                        <p><strong>Rows:</strong> {excel_info['shape'][0]:,} | <strong>Columns:</strong> {excel_info['shape'][1]}</p>
                     </div>
                     """, unsafe_allow_html=True)
                     
-                    # Display the Excel data (first 25 rows)
-                    st.dataframe(excel_info['data'], use_container_width=True, height=400)
+                    if excel_info.get('kind') == 'csv':
+                        # Streamed extract: column summaries plus a random sample of rows
+                        stats_table, sample_table = csv_tables(excel_info)
+                        st.dataframe(stats_table, use_container_width=True, hide_index=True)
+                        st.caption(f"Random sample of {len(excel_info['data'])} of {excel_info['shape'][0]:,} rows")
+                        st.dataframe(sample_table, use_container_width=True, height=400)
+                        continue
+                    
+                    # Display the Excel data (first rows), marking changes since the previous version
+                    diff = excel_info.get('diff')
+                    if diff:
+                        st.caption(f"Changes since previous upload: {describe_diff(diff)} (listed first)")
+                    st.dataframe(sheet_preview_table(excel_info), use_container_width=True, height=400)
+                    if diff and len(changed_positions(diff)) > EXCEL_PREVIEW_ROWS:
+                        with st.expander(f"🟡 All added and changed rows ({len(changed_positions(diff))})", expanded=False):
+                            st.dataframe(changed_rows_table(excel_info), use_container_width=True)
+                    if diff and len(diff['removed_rows']):
+                        with st.expander(f"🔴 Removed rows ({len(diff['removed_rows'])})", expanded=False):
+                            st.dataframe(diff['removed_rows'], use_container_width=True)
+
+            # Display charts
+            for chart in page_data['charts']:
+                source = page_data['excel_files'][chart['file']] if chart['file'] < len(page_data['excel_files']) else None
+                data = chart_data(source, chart) if source is not None else None
+                if data is None:
+                    continue
+                st.markdown(f"**{', '.join(chart['y'])}** ({source['filename']})")
+                x_name = data.columns[0]
+                if chart['kind'] == "Bar":
+                    st.bar_chart(data, x=x_name, y=chart['y'])
+                elif chart['kind'] == "Scatter":
+                    st.scatter_chart(data, x=x_name, y=chart['y'])
+                else:
+                    st.line_chart(data, x=x_name, y=chart['y'])
+                plotted = source['shape'][0] if source.get('kind') != 'csv' else len(source['data'])
+                if len(data) < plotted:
+                    st.caption(f"Showing {len(data):,} of {plotted:,} points (downsampled)")
+                if source.get('kind') == 'csv':
+                    st.caption(f"Charted from a random sample of {len(source['data'])} of {source['shape'][0]:,} rows")
+
+            # Display pivots
+            for pivot in page_data['pivots']:
+                source = page_data['excel_files'][pivot['file']] if pivot['file'] < len(page_data['excel_files']) else None
+                table = pivot_table(source, pivot) if source is not None and source.get('kind') != 'csv' else None
+                if table is None:
+                    continue
+                measures = f"{pivot['agg']} of {', '.join(pivot['values'])}" if pivot['values'] else "Rows"
+                st.markdown(f"**{measures} by {', '.join(pivot['by'])}** ({source['filename']})")
+                st.dataframe(table, use_container_width=True, hide_index=True)
         else:
             # No content - show empty grid
             st.info("No pictures or Excel files uploaded yet. Use the sidebar to add content.")
@@ -995,3 +2815,14 @@ if not st.session_state.screenshot_mode:
             st.session_state.current_page = get_next_page()
             st.rerun()
 
+# Record this run's edits as one undo step (only changed paths are stored)
+record_board_history(selected_team)
+board_history = get_board_history(selected_team)
+with history_controls:
+    undo_col, redo_col = st.columns(2)
+    with undo_col:
+        st.button("↩️ Undo", use_container_width=True, disabled=not board_history['undo'],
+                  on_click=undo_board, args=(selected_team,), key="undo_board")
+    with redo_col:
+        st.button("↪️ Redo", use_container_width=True, disabled=not board_history['redo'],
+                  on_click=redo_board, args=(selected_team,), key="redo_board")